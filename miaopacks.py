@@ -2,109 +2,300 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import zipfile
 import os
+import sys
 import shutil
 import json
+import re
 from PIL import Image, ImageTk
 import subprocess
+from subprocess import Popen, DEVNULL
 from tkinter import ttk
 import math
-import pyperclip
+
+# orjson 为可选依赖，解析速度更快；未安装时使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import functools
+import threading
+import queue
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+import zlib
+import struct
+import time
+import io
+import collections
+import filecmp
+
+# 程序所在目录和材质包缓存目录
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(APP_DIR, 'packagecache')
+
+def load_json_bytes(data):
+    """解析 JSON 字节串（兼容带 BOM 的 UTF-8），装有 orjson 时优先使用 orjson"""
+    if data.startswith(b'\xef\xbb\xbf'):
+        data = data[3:]
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+def dump_json_bytes(obj):
+    """把对象序列化为带缩进的 JSON 字节串，装有 orjson 时优先使用 orjson"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=4).encode('utf-8')
+
+# 复制文件时使用的缓冲区大小（1 MiB）
+COPY_BUFSIZE = 1 << 20
+
+def copy_file(source_path, target_path):
+    """复制文件并保留文件属性（相当于 shutil.copy2）
+    
+    优先使用 os.copy_file_range 在内核中复制（支持的文件系统上可以直接共享数据块），
+    不支持时使用 1 MiB 缓冲区的 readinto 循环复制。
+    
+    Raises:
+        shutil.SameFileError: 源文件和目标文件是同一个文件（以写入方式打开目标会清空源文件）
+    """
+    if os.path.exists(target_path) and os.path.samefile(source_path, target_path):
+        raise shutil.SameFileError(f"{source_path!r} and {target_path!r} are the same file")
+    
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        copied = False
+        if hasattr(os, 'copy_file_range'):
+            try:
+                # 复制到返回 0（文件末尾）为止，不依赖 st_size（有的文件系统报告的大小为 0）
+                blocksize = max(os.fstat(src.fileno()).st_size, COPY_BUFSIZE)
+                offset = 0
+                while True:
+                    sent = os.copy_file_range(src.fileno(), dst.fileno(), blocksize)
+                    if sent == 0:
+                        break
+                    offset += sent
+                # 一个字节都没复制时（空文件或不支持的文件系统）改用普通复制
+                copied = offset > 0
+            except OSError:
+                # 跨文件系统等情况不支持，从头改用普通复制
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        if not copied:
+            buffer = bytearray(COPY_BUFSIZE)
+            view = memoryview(buffer)
+            while True:
+                size = src.readinto(view)
+                if not size:
+                    break
+                dst.write(view[:size])
+    shutil.copystat(source_path, target_path)
+
+def read_file_bytes(file_path):
+    """读取文件的全部内容"""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+def run_detached(args):
+    """在新的会话中启动外部程序并立即返回，不等待程序退出
+    
+    xdg-open 等程序可能一直运行到打开的应用关闭，用 subprocess.run 会卡住界面。
+    
+    Args:
+        args: 命令行参数列表，Windows 下也可以是完整的命令行字符串
+    """
+    if os.name == 'nt':
+        options = {'creationflags': subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        options = {'start_new_session': True}
+    Popen(args, stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL, close_fds=True, **options)
+
+# 启动时按系统确定打开文件和在文件夹中显示文件的方式
+if os.name == 'nt':  # Windows
+    open_path = os.startfile
+    
+    def reveal_path(path):
+        """在资源管理器中显示文件（/select, 和路径必须连在一起，路径含空格时加引号）"""
+        run_detached(f'explorer /select,"{os.path.normpath(path)}"')
+elif sys.platform == 'darwin':  # macOS
+    def open_path(path):
+        """使用系统默认程序打开文件或文件夹"""
+        run_detached(['open', path])
+    
+    def reveal_path(path):
+        """在访达中显示文件"""
+        run_detached(['open', '-R', path])
+else:  # Linux
+    def open_path(path):
+        """使用系统默认程序打开文件或文件夹"""
+        run_detached(['xdg-open', path])
+    
+    def reveal_path(path):
+        """打开文件所在的文件夹"""
+        run_detached(['xdg-open', os.path.dirname(path)])
+
+# 把路径中的反斜杠换成正斜杠
+PATH_SEP_TRANS = str.maketrans('\\', '/')
+
+def get_rel_path(path):
+    """统一相对路径的写法（去掉 "./"，使用正斜杠），与压缩包内的文件名一致"""
+    return os.path.normpath(path).translate(PATH_SEP_TRANS)
 
 # 添加以下函数来处理图片操作
-def split_image(image_path, crop_box, target_path):
+def load_image(image_path):
+    """读取图片并完整解码到内存
+    
+    Args:
+        image_path: 图片路径
+    Returns:
+        Image: 已解码的图片对象，不再占用文件句柄
+    """
+    with Image.open(image_path) as img:
+        img.load()
+        return img.copy()
+
+def encode_image(image, file_name):
+    """把图片编码为文件内容
+    
+    Args:
+        image: 图片对象
+        file_name: 目标文件名，根据扩展名决定图片格式
+    Returns:
+        bytes: 编码后的文件内容
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, Image.registered_extensions()[os.path.splitext(file_name)[1].lower()])
+    return buffer.getvalue()
+
+def split_image(image, crop_box, target_name):
     """裁剪图片
     
     Args:
-        image_path: 源图片路径
+        image: 已加载的源图片
         crop_box: 裁剪区域 (left, top, right, bottom)
-        target_path: 目标图片保存路径
+        target_name: 目标图片文件名
+    Returns:
+        bytes: 裁剪后的图片内容，出错时返回 None
     """
     try:
-        with Image.open(image_path) as img:
-            cropped = img.crop(crop_box)
-            # 确保目标目录存在
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            cropped.save(target_path)
-        return True
+        return encode_image(image.crop(crop_box), target_name)
     except Exception as e:
         print(f"裁剪图片出错：{str(e)}")
-        return False
+        return None
 
-def merge_images(base_path, overlay_path, position, target_path=None):
+def merge_images(base_file, overlays, target_name):
     """合并图片
     
     Args:
-        base_path: 底图路径
-        overlay_path: 要叠加的图片路径
-        position: 叠加位置 (x, y)
-        target_path: 保存路径，如果为None则覆盖base_path
+        base_file: 底图路径或文件对象
+        overlays: 要叠加的图片列表 [(RGBA 图片, 叠加位置 (x, y)), ...]，按顺序叠加
+        target_name: 目标图片文件名
+    Returns:
+        bytes: 合并后的图片内容，出错时返回 None
     """
     try:
-        with Image.open(base_path) as base:
-            with Image.open(overlay_path) as overlay:
-                # 转换为RGBA模式以支持透明度
-                base = base.convert('RGBA')
-                overlay = overlay.convert('RGBA')
-                # 粘贴图片
-                base.paste(overlay, position, overlay)
-                # 保存结果
-                save_path = target_path or base_path
-                os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                base.save(save_path)
-        return True
+        with Image.open(base_file) as base:
+            # 转换为RGBA模式以支持透明度
+            base = base.convert('RGBA')
+        # 依次粘贴所有图片，最后只编码一次
+        for overlay, position in overlays:
+            base.paste(overlay, position, overlay)
+        return encode_image(base, target_name)
     except Exception as e:
         print(f"合并图片出错：{str(e)}")
-        return False
+        return None
 
-def get_version_category(version):
-    """获取版本所属的大类
+@functools.lru_cache(maxsize=None)
+def get_version_num(version):
+    """将版本号转换为可比较的数值
     
     Args:
         version: 具体版本号，如 "1.19.4"
     Returns:
-        version_category: 版本大类，如 "1.19"
+        float: 版本数值，如 19.4
     """
-    version_num = float(version.replace("1.", ""))
-    if version_num <= 19.4:
-        return "1.19"
-    elif version_num <= 20.6:
-        return "1.20"
-    else:
-        return "1.21"
+    return float(version.replace("1.", ""))
+
+# pack.mcmeta 中的 pack_format 与版本号的对应关系
+PACK_FORMAT_TO_VERSION = {
+    6: "1.16.5",
+    7: "1.17.1",
+    8: "1.18.2",
+    9: "1.19.2",
+    12: "1.19.3",
+    13: "1.19.4",
+    15: "1.20.1",
+    18: "1.20.2",
+    26: "1.20.4",
+    30: "1.21"
+}
 
+# 版本号对应的 pack_format（转换时写入 pack.mcmeta）
+VERSION_FORMAT = {version: pack_format for pack_format, version in PACK_FORMAT_TO_VERSION.items()}
+
+def scan_files(root_dir, rel_dir='.'):
+    """递归列出目录下的所有文件（使用 os.scandir 减少 stat 调用）
+    
+    Args:
+        root_dir: 要遍历的目录
+        rel_dir: root_dir 相对于遍历起点的路径
+    Yields:
+        (rel_dir, entry): 文件所在目录的相对路径和对应的 os.DirEntry
+    """
+    with os.scandir(root_dir) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                sub_dir = entry.name if rel_dir == '.' else os.path.join(rel_dir, entry.name)
+                yield from scan_files(entry.path, sub_dir)
+            elif entry.is_file():
+                yield rel_dir, entry
+
+@functools.lru_cache(maxsize=1)
 def load_version_configs():
-    """加载所有版本配置"""
+    """加载所有版本配置（只在首次调用时读取）"""
     configs = {}
-    config_dir = os.path.join(os.path.dirname(__file__), 'config')
-    for file in os.listdir(config_dir):
-        if file.endswith('.json'):
-            version = file.replace('.json', '')
-            with open(os.path.join(config_dir, file), 'r', encoding='utf-8') as f:
-                configs[version] = json.load(f)
+    config_dir = os.path.join(APP_DIR, 'config')
+    with os.scandir(config_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith('.json'):
+                version = entry.name.replace('.json', '')
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    configs[version] = json.load(f)
     return configs
 
 def get_available_versions():
     """从配置文件中获取所有可用的版本"""
     versions = set()
-    config_dir = os.path.join(os.path.dirname(__file__), 'config')
+    config_dir = os.path.join(APP_DIR, 'config')
     
     # 遍历配置目录中的所有json文件
-    for file in os.listdir(config_dir):
-        if file.endswith('.json'):
-            try:
-                with open(os.path.join(config_dir, file), 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # 将该配置文件中定义的版本添加到集合中
-                    if 'versions' in config:
-                        versions.update(config['versions'])
-            except Exception as e:
-                print(f"读取配置文件 {file} 出错：{str(e)}")
+    with os.scandir(config_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith('.json'):
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
+                        # 将该配置文件中定义的版本添加到集合中
+                        if 'versions' in config:
+                            versions.update(config['versions'])
+                except Exception as e:
+                    print(f"读取配置文件 {entry.name} 出错：{str(e)}")
     
     # 将版本号按数字大小排序（降序）
     return sorted(list(versions), 
                  key=lambda x: [int(n) for n in x.replace('1.', '').split('.')], 
                  reverse=True)
 
+@functools.lru_cache(maxsize=1)
+def get_sorted_config_versions():
+    """获取按版本号升序排列的配置版本
+    
+    Returns:
+        tuple: (版本号元组, 对应的版本数值元组)
+    """
+    versions = sorted(load_version_configs(), key=get_version_num)
+    return tuple(versions), tuple(get_version_num(v) for v in versions)
+
 def get_version_operations(source_version, target_version):
     """获取从源版本到目标版本的所有操作
     
@@ -115,35 +306,21 @@ def get_version_operations(source_version, target_version):
         list: 需要执行的操作列表
     """
     configs = load_version_configs()
-    source_num = float(source_version.replace('1.', ''))
-    target_num = float(target_version.replace('1.', ''))
+    sorted_versions, version_nums = get_sorted_config_versions()
+    source_num = get_version_num(source_version)
+    target_num = get_version_num(target_version)
     
     # 确定需要经过的版本
-    version_path = []
-    current_version = source_version
-    
-    # 从源版本开始，找到通向目标版本的路径
-    while float(current_version.replace('1.', '')) != target_num:
-        next_version = None
-        next_num = float('inf') if target_num > source_num else float('-inf')
-        
-        for version, config in configs.items():
-            version_num = float(version.replace('1.', ''))
-            if target_num > source_num:
-                # 向上升级
-                if version_num > float(current_version.replace('1.', '')) and version_num <= target_num and version_num < next_num:
-                    next_version = version
-                    next_num = version_num
-            else:
-                # 向下降级
-                if version_num < float(current_version.replace('1.', '')) and version_num >= target_num and version_num > next_num:
-                    next_version = version
-                    next_num = version_num
-        
-        if next_version is None:
-            break
-        version_path.append(next_version)
-        current_version = next_version
+    if target_num > source_num:
+        # 向上升级：经过 (源版本, 目标版本] 区间内的所有版本
+        start = bisect.bisect_right(version_nums, source_num)
+        end = bisect.bisect_right(version_nums, target_num)
+        version_path = sorted_versions[start:end]
+    else:
+        # 向下降级：经过 [目标版本, 源版本) 区间内的所有版本，从高到低
+        start = bisect.bisect_left(version_nums, target_num)
+        end = bisect.bisect_left(version_nums, source_num)
+        version_path = sorted_versions[start:end][::-1]
     
     # 收集所有操作
     operations = []
@@ -156,10 +333,102 @@ def get_version_operations(source_version, target_version):
     
     return operations
 
-def process_version_conversion(source_path, target_path, source_version, target_version, scale_factor=1):
-    """处理版本转换"""
+def run_in_parallel(executor, func, tasks):
+    """并行执行一批互不依赖的任务，并等待全部完成
+    
+    Args:
+        executor: 线程池
+        func: 任务函数
+        tasks: 每个任务的参数元组列表
+    Returns:
+        list: 各任务的返回值（顺序与 tasks 一致）
+    """
+    futures = [executor.submit(func, *args) for args in tasks]
+    return [future.result() for future in futures]
+
+def process_version_conversion(source_path, overrides, source_version, target_version, scale_factor=1):
+    """处理版本转换
+    
+    Args:
+        source_path: 材质包缓存目录（只读取，不修改）
+        overrides: 转换生成的文件 {压缩包内的相对路径: 文件内容}，会在此字典中添加或覆盖
+        source_version: 源版本号
+        target_version: 目标版本号
+        scale_factor: 分辨率倍数
+    Returns:
+        (success, exclude_files): 是否成功，以及需要从材质包中排除的文件
+    """
     operations = get_version_operations(source_version, target_version)
     exclude_files = set()
+    # 合并时同一覆盖图片可能用于多个目标，缓存解码结果
+    # （分割操作按源文件分组，每个源文件只读取一次，不需要缓存）
+    @functools.lru_cache(maxsize=64)
+    def load_source_rgba(image_path):
+        """获取 RGBA 模式的源图片（合并时使用，同一图片只转换一次）"""
+        image = load_image(image_path)
+        return image if image.mode == 'RGBA' else image.convert('RGBA')
+    
+    def target_exists(rel_path):
+        """检查转换结果中是否存在该文件（已生成或材质包中原有）"""
+        return rel_path in overrides or os.path.exists(os.path.join(source_path, rel_path))
+    
+    def open_target(rel_path):
+        """获取转换结果中的文件：已生成的从内存读取，否则读取材质包中原有的文件"""
+        data = overrides.get(rel_path)
+        if data is not None:
+            return io.BytesIO(data)
+        return os.path.join(source_path, rel_path)
+    
+    def save_target(rel_path, data):
+        """记录生成的文件，出错时（data 为 None）保持原样"""
+        if data is not None:
+            overrides[rel_path] = data
+    # PIL 编解码时会释放 GIL，图片操作可以用线程池并行
+    executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    
+    def split_source(source_file, splits):
+        """把一张源图片分割成多张目标图片"""
+        source_file_path = os.path.join(source_path, source_file)
+        if not os.path.exists(source_file_path):
+            return
+        # 源图片只在分割期间保留在内存中，分割完成后立即释放
+        try:
+            with Image.open(source_file_path) as source_image:
+                source_image.load()
+                for split in splits:
+                    target_file = get_rel_path(split["target"])
+                    # 调整裁剪坐标
+                    scaled_source = [x * scale_factor for x in split["source"]]
+                    save_target(target_file, split_image(source_image, scaled_source, target_file))
+        except Exception as e:
+            print(f"读取图片出错：{str(e)}")
+    
+    def merge_into(target_file, merges):
+        """把多张图片依次合并到同一张目标图片上"""
+        target_file = get_rel_path(target_file)
+        overlays = []
+        for merge in merges:
+            source_file_path = os.path.join(source_path, merge["source"])
+            if os.path.exists(source_file_path):
+                try:
+                    overlay = load_source_rgba(source_file_path)
+                except Exception as e:
+                    print(f"读取图片出错：{str(e)}")
+                    continue
+                # 调整合并位置
+                scaled_position = [x * scale_factor for x in merge["position"]]
+                overlays.append((overlay, scaled_position))
+        if overlays:
+            save_target(target_file, merge_images(open_target(target_file), overlays, target_file))
+    
+    def make_transparent(source_file, trans_config):
+        """以源图片为基础，将保留区域外变为透明"""
+        source_file_path = os.path.join(source_path, source_file)
+        if os.path.exists(source_file_path):
+            target_file = get_rel_path(trans_config["target"])
+            # 调整保留区域坐标 (先加1再乘以倍数再减1)
+            scaled_keep_area = [(x + 1) * scale_factor - 1 for x in trans_config["keep_area"]]
+            save_target(target_file, apply_transparency(source_file_path, scaled_keep_area, target_file))
     
     try:
         # 处理所有转换操作
@@ -167,126 +436,115 @@ def process_version_conversion(source_path, target_path, source_version, target_
             config = operation['config']
             version = operation['version']
             
-            # 处理文件的添加和删除
+            # 处理文件的添加和删除（只在主线程中修改 exclude_files）
             for file in config.get('removed_files', []):
                 exclude_files.add(file)
             
-            # 处理分割操作
-            for source_file, splits in config.get('split_operations', {}).items():
-                source_file_path = os.path.join(source_path, source_file)
-                if os.path.exists(source_file_path):
-                    for split in splits:
-                        target_file = os.path.join(target_path, split["target"])
-                        # 调整裁剪坐标
-                        scaled_source = [x * scale_factor for x in split["source"]]
-                        split_image(source_file_path, scaled_source, target_file)
+            # 各阶段内的任务互不依赖，可以并行；阶段之间按顺序执行
+            # 处理分割操作（每个源文件一个任务）
+            run_in_parallel(executor, split_source, config.get('split_operations', {}).items())
             
-            # 处理合并操作
-            for target_file, merges in config.get('merge_operations', {}).items():
-                target_file_path = os.path.join(target_path, target_file)
-                for merge in merges:
-                    source_file = merge["source"]
-                    source_file_path = os.path.join(source_path, source_file)
-                    if os.path.exists(source_file_path):
-                        # 调整合并位置
-                        scaled_position = [x * scale_factor for x in merge["position"]]
-                        merge_images(target_file_path, source_file_path, scaled_position)
+            # 处理合并操作（同一目标文件的合并在同一个任务中按顺序执行）
+            run_in_parallel(executor, merge_into, config.get('merge_operations', {}).items())
             
             # 处理透明度操作
-            for source_file, trans_config in config.get('transparency_operations', {}).items():
-                source_file_path = os.path.join(source_path, source_file)
-                if os.path.exists(source_file_path):
-                    target_file = os.path.join(target_path, trans_config["target"])
-                    os.makedirs(os.path.dirname(target_file), exist_ok=True)
-                    shutil.copy2(source_file_path, target_file)
-                    # 调整保留区域坐标 (先加1再乘以倍数再减1)
-                    scaled_keep_area = [(x + 1) * scale_factor - 1 for x in trans_config["keep_area"]]
-                    apply_transparency(target_file, scaled_keep_area)
+            run_in_parallel(executor, make_transparent, config.get('transparency_operations', {}).items())
             
             # 处理当前版本的 mcmeta 文件
-            mcmeta_version_path = os.path.join(os.path.dirname(__file__), 'config', 'mcmetaFile', version)
             print(f"在处理版本 {version} 的 mcmeta 文件")
             
-            if os.path.exists(mcmeta_version_path):
-                for root, dirs, files in os.walk(mcmeta_version_path):
-                    for file in files:
-                        if file.endswith('.mcmeta'):
-                            # 获取相对于版本目录的路径
-                            rel_path = os.path.relpath(root, mcmeta_version_path)
-                            original_file = file[:-7]
-                            
-                            print(f"找到 mcmeta 文件: {file}")
-                            print(f"相对路径: {rel_path}")
-                            
-                            # 检查是否是分割操作产生的文件
-                            is_split_target = False
-                            for _, splits in config.get('split_operations', {}).items():
-                                for split in splits:
-                                    split_target = split['target'].replace('\\', '/')
-                                    check_path = os.path.join(rel_path, original_file).replace('\\', '/')
-                                    if split_target == check_path:
-                                        is_split_target = True
-                                        break
-                                if is_split_target:
-                                    break
-                            
-                            # 构建目标路径
-                            target_dir = os.path.join(target_path, rel_path)
-                            target_original_file = os.path.join(target_dir, original_file)
-                            
-                            # 如果是分割操作的目标文件或者原始文件存在，则复制对应的.mcmeta文件
-                            if is_split_target or os.path.exists(target_original_file):
-                                source_mcmeta = os.path.join(root, file)
-                                target_mcmeta = os.path.join(target_dir, file)
-                                
-                                print(f"正在复制 mcmeta 文件:")
-                                print(f"源文件: {source_mcmeta}")
-                                print(f"目标文件: {target_mcmeta}")
-                                
-                                os.makedirs(os.path.dirname(target_mcmeta), exist_ok=True)
-                                shutil.copy2(source_mcmeta, target_mcmeta)
-                                print(f"版本 {version} 的 mcmeta 文件复制完成")
+            # 配置中所有分割操作的目标文件
+            split_targets = {get_rel_path(split['target'])
+                             for splits in config.get('split_operations', {}).values()
+                             for split in splits}
+            
+            # 先收集需要补充的 mcmeta 文件，再并行读取
+            mcmeta_copies = []
+            for rel_path, file, source_mcmeta in MCMETA_INDEX.get(version, []):
+                original_file = file[:-7]
+                
+                print(f"找到 mcmeta 文件: {file}")
+                print(f"相对路径: {rel_path}")
+                
+                check_path = get_rel_path(os.path.join(rel_path, original_file))
+                is_split_target = check_path in split_targets
+                
+                # 如果是分割操作的目标文件或者原始文件存在，则复制对应的.mcmeta文件
+                if is_split_target or target_exists(check_path):
+                    target_mcmeta = get_rel_path(os.path.join(rel_path, file))
+                    
+                    print(f"正在复制 mcmeta 文件:")
+                    print(f"源文件: {source_mcmeta}")
+                    print(f"目标文件: {target_mcmeta}")
+                    mcmeta_copies.append((target_mcmeta, source_mcmeta))
+            
+            contents = run_in_parallel(executor, read_file_bytes,
+                                       [(source_mcmeta,) for _, source_mcmeta in mcmeta_copies])
+            for (target_mcmeta, _), data in zip(mcmeta_copies, contents):
+                overrides[target_mcmeta] = data
+            print(f"版本 {version} 的 mcmeta 文件复制完成")
         
         return True, exclude_files
     except Exception as e:
         print(f"处理版本转换时出错：{str(e)}")
         messagebox.showerror("错误", f"处理版本转换时出错：{str(e)}")
         return False, exclude_files
+    finally:
+        executor.shutdown()
 
-def apply_transparency(image_path, keep_area, target_path=None):
+def apply_transparency(image_file, keep_area, target_name):
     """将指定区域外的像素变为透明
     
     Args:
-        image_path: 源图片路径
+        image_file: 源图片路径或文件对象
         keep_area: 保持不透明的区域 (left, top, right, bottom)
-        target_path: 保存路径，如果为None则覆盖原图
+        target_name: 目标图片文件名
+    Returns:
+        bytes: 处理后的图片内容，出错时返回 None
     """
     try:
-        with Image.open(image_path) as img:
+        with Image.open(image_file) as img:
             # 转换为RGBA模式以支持透明度
             img = img.convert('RGBA')
-            # 获取图片尺寸
+            
             width, height = img.size
-            # 创建像素访问对象
-            pixels = img.load()
+            # 保持区域与图片的交集（right/bottom 为包含边界，转换为 PIL 的不包含边界）
+            left, top, right, bottom = keep_area
+            box = (max(left, 0), max(top, 0), min(right + 1, width), min(bottom + 1, height))
             
-            # 遍历所有像素
-            for y in range(height):
-                for x in range(width):
-                    # 如果像素在保持区域外，将其设为透明
-                    if not (keep_area[0] <= x <= keep_area[2] and 
-                           keep_area[1] <= y <= keep_area[3]):
-                        r, g, b, a = pixels[x, y]
-                        pixels[x, y] = (r, g, b, 0)
+            # 保持区域覆盖整张图片时无需修改透明度
+            if box != (0, 0, width, height):
+                # 新的透明度通道：区域外为0，区域内直接拷贝原透明度
+                alpha = Image.new('L', img.size, 0)
+                if box[0] < box[2] and box[1] < box[3]:
+                    alpha.paste(img.getchannel('A').crop(box), box[:2])
+                img.putalpha(alpha)
             
-            # 保存结果
-            save_path = target_path or image_path
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            img.save(save_path)
-        return True
+            return encode_image(img, target_name)
     except Exception as e:
         print(f"处理图片透明度时出错：{str(e)}")
-        return False
+        return None
+
+def index_mcmeta_files():
+    """扫描 config/mcmetaFile 下各版本需要补充的 mcmeta 文件
+    
+    Returns:
+        dict: {版本号: [(相对目录, 文件名, 完整路径), ...]}
+    """
+    index = {}
+    mcmeta_dir = os.path.join(APP_DIR, 'config', 'mcmetaFile')
+    if not os.path.exists(mcmeta_dir):
+        return index
+    with os.scandir(mcmeta_dir) as it:
+        for entry in it:
+            if entry.is_dir():
+                index[entry.name] = [(rel_path, file.name, file.path)
+                                     for rel_path, file in scan_files(entry.path)
+                                     if file.name.endswith('.mcmeta')]
+    return index
+
+# mcmeta 文件在程序运行期间不会变化，启动时扫描一次即可
+MCMETA_INDEX = index_mcmeta_files()
 
 # 添加一些全局样式变量
 COLORS = {
@@ -305,58 +563,63 @@ COLORS = {
     'button_border': '#D1D1D1'  # 按钮边框色
 }
 
-def style_button(button):
-    """Windows 11 风格的按钮样式"""
-    button.configure(
+# Windows 11 风格的按钮样式
+BUTTON_STYLE = {
+    'bg': COLORS['button'],
+    'fg': COLORS['text'],
+    'relief': 'flat',
+    'bd': 1,
+    'highlightthickness': 1,
+    'highlightbackground': COLORS['button_border'],
+    'highlightcolor': COLORS['button_border'],
+    'padx': 15,
+    'pady': 5,
+    'font': ('Segoe UI', 9),  # Win11 默认字体
+    'cursor': 'hand2'
+}
+
+def on_button_enter(e):
+    """鼠标进入时的效果"""
+    e.widget.configure(
+        bg=COLORS['button_hover'],
+        highlightbackground=COLORS['primary'],
+        highlightcolor=COLORS['primary']
+    )
+
+def on_button_leave(e):
+    """鼠标离开时的效果"""
+    e.widget.configure(
         bg=COLORS['button'],
-        fg=COLORS['text'],
-        relief='flat',
-        bd=1,
-        highlightthickness=1,
         highlightbackground=COLORS['button_border'],
-        highlightcolor=COLORS['button_border'],
-        padx=15,
-        pady=5,
-        font=('Segoe UI', 9),  # Win11 默认字体
-        cursor='hand2'
+        highlightcolor=COLORS['button_border']
     )
-    
-    def on_enter(e):
-        """鼠标进入时的效果"""
-        e.widget.configure(
-            bg=COLORS['button_hover'],
-            highlightbackground=COLORS['primary'],
-            highlightcolor=COLORS['primary']
-        )
-    
-    def on_leave(e):
-        """鼠标离开时的效果"""
-        e.widget.configure(
-            bg=COLORS['button'],
-            highlightbackground=COLORS['button_border'],
-            highlightcolor=COLORS['button_border']
-        )
-    
-    def on_press(e):
-        """鼠标按下时的效果"""
-        e.widget.configure(bg=COLORS['button_pressed'])
-    
-    def on_release(e):
-        """鼠标释放时的效果"""
-        e.widget.configure(bg=COLORS['button_hover'])
-    
-    button.bind('<Enter>', on_enter)
-    button.bind('<Leave>', on_leave)
-    button.bind('<Button-1>', on_press)
-    button.bind('<ButtonRelease-1>', on_release)
+
+def on_button_press(e):
+    """鼠标按下时的效果"""
+    e.widget.configure(bg=COLORS['button_pressed'])
+
+def on_button_release(e):
+    """鼠标释放时的效果"""
+    e.widget.configure(bg=COLORS['button_hover'])
+
+def style_button(button):
+    """Windows 11 风格的按钮样式（悬停和按下效果绑定在共用的 StyledButton 标签上）"""
+    button.configure(**BUTTON_STYLE)
+    button.bindtags(('StyledButton',) + button.bindtags())
 
 # 创建主窗口
 root = tk.Tk()
 root.title("喵喵的材质包管理器")
 
+# 所有按钮共用的悬停和按下效果
+root.bind_class('StyledButton', '<Enter>', on_button_enter)
+root.bind_class('StyledButton', '<Leave>', on_button_leave)
+root.bind_class('StyledButton', '<Button-1>', on_button_press)
+root.bind_class('StyledButton', '<ButtonRelease-1>', on_button_release)
+
 # 设置窗口图标
 try:
-    icon_path = os.path.join(os.path.dirname(__file__), 'icon', 'miao.png')
+    icon_path = os.path.join(APP_DIR, 'icon', 'miao.png')
     if os.path.exists(icon_path):
         icon = ImageTk.PhotoImage(file=icon_path)
         root.iconphoto(True, icon)
@@ -437,6 +700,9 @@ frame_operate.place(x=300, y=660, width=980, height=40)
 
 selected_label = None
 
+# 已添加的材质包文件名，用于快速检查重复
+loaded_file_names = set()
+
 # 添加 Minecraft 颜色代码映射
 MC_COLORS = {
     '§0': '#000000',  # 黑色
@@ -457,136 +723,246 @@ MC_COLORS = {
     '§f': '#FFFFFF',  # 白
 }
 
+# 匹配颜色代码的正则（带捕获组，split 时会保留颜色代码本身）
+MC_COLOR_PATTERN = re.compile('(' + '|'.join(map(re.escape, MC_COLORS)) + ')')
+
 def create_colored_text_label(parent, text):
     """创建一个支持 Minecraft 颜色代码的标签"""
     frame = tk.Frame(parent, background=parent.cget('background'))
-    current_index = 0
     current_color = '#000000'  # 默认黑色
     
-    while current_index < len(text):
-        if text[current_index:current_index+2] in MC_COLORS:
-            current_color = MC_COLORS[text[current_index:current_index+2]]
-            current_index += 2
-        else:
-            # 找到下一个颜色代码或文本结束
-            next_code_index = len(text)
-            for code in MC_COLORS:
-                pos = text.find(code, current_index)
-                if pos != -1 and pos < next_code_index:
-                    next_code_index = pos
-            
+    # 一次扫描把文本拆分成颜色代码和普通文本片段
+    for segment in MC_COLOR_PATTERN.split(text):
+        if segment in MC_COLORS:
+            current_color = MC_COLORS[segment]
+        elif segment:
             # 创建这段文本的标签
-            segment = text[current_index:next_code_index]
-            if segment:
-                label = tk.Label(frame, text=segment, fg=current_color, 
-                               background=parent.cget('background'))
-                label.pack(side=tk.LEFT)
-            current_index = next_code_index
+            label = tk.Label(frame, text=segment, fg=current_color, 
+                           background=parent.cget('background'))
+            label.pack(side=tk.LEFT)
     
     return frame
 
-def create_file_label(file_path):
-    """创建一个现代风格的文件标签"""
+# 材质包图标缓存：{(图标路径, 尺寸): (修改时间, PhotoImage)}
+PACK_ICON_CACHE = {}
+
+# 图标加载完成前显示的空白占位图
+PACK_ICON_PLACEHOLDER = tk.PhotoImage(width=64, height=64)
+
+def load_pack_icon(icon_path, size):
+    """读取并缩放材质包图标（不涉及 Tk 控件，可以在后台线程中调用）
+    
+    Args:
+        icon_path: pack.png 的路径
+        size: 图标边长
+    Returns:
+        tuple: (修改时间, 缩放后的图片)，缓存仍然有效时图片为 None；
+               图标不存在时返回 None
+    """
+    if not os.path.exists(icon_path):
+        return None
+    
+    mtime = os.path.getmtime(icon_path)
+    cached = PACK_ICON_CACHE.get((icon_path, size))
+    if cached and cached[0] == mtime:
+        return mtime, None
+    
+    # 加载图片并调整大小
+    with Image.open(icon_path) as image:
+        # JPEG 格式可以在解码时直接按比例缩小（其他格式无效果）
+        image.draft('RGB', (size * 2, size * 2))
+        # 大图先用 reduce 快速缩小到目标尺寸的两倍左右，再用 LANCZOS 缩放到最终尺寸
+        factor = min(image.size) // (size * 2)
+        if factor > 1 and image.mode in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.reduce(factor)
+        return mtime, image.resize((size, size), Image.Resampling.LANCZOS)
+
+def get_pack_icon(icon_path, size, loaded=None):
+    """获取缩放后的材质包图标，图标文件未修改时直接复用缓存
+    
+    Args:
+        icon_path: pack.png 的路径
+        size: 图标边长
+        loaded: 后台线程中 load_pack_icon 的结果，为 None 时在这里读取
+    Returns:
+        ImageTk.PhotoImage: 缩放后的图标，图标不存在时返回 None
+    """
+    if loaded is None:
+        loaded = load_pack_icon(icon_path, size)
+        if loaded is None:
+            return None
+    
+    mtime, image = loaded
+    if image is None:
+        return PACK_ICON_CACHE[(icon_path, size)][1]
+    photo = ImageTk.PhotoImage(image)
+    PACK_ICON_CACHE[(icon_path, size)] = (mtime, photo)
+    return photo
+
+def read_pack_mcmeta(mcmeta_path):
+    """读取 pack.mcmeta，文件不存在或读取失败时返回 None"""
+    try:
+        if os.path.exists(mcmeta_path):
+            with open(mcmeta_path, 'rb') as f:
+                return load_json_bytes(f.read())
+    except Exception as e:
+        print(f"读取pack.mcmeta出错：{str(e)}")
+    return None
+
+def get_pack_row(widget):
+    """找到控件所在的文件标签"""
+    while not hasattr(widget, 'full_path'):
+        widget = widget.master
+    return widget
+
+def add_pack_row_tag(widget):
+    """让控件响应文件标签的点击事件"""
+    widget.bindtags(('PackRow',) + widget.bindtags())
+
+def on_pack_row_click(event):
+    """点击文件标签中的任意元素时选中该标签"""
+    select_label(get_pack_row(event.widget))
+
+def set_pack_row_color(frame, color):
+    """设置文件标签及其直接子控件的背景色"""
+    frame.configure(bg=color)
+    for child in frame.winfo_children():
+        child.configure(bg=color)
+
+def on_pack_row_enter(event):
+    """鼠标进入文件标签时的悬停效果"""
+    if event.widget != selected_label:
+        set_pack_row_color(event.widget, COLORS['hover'])
+
+def on_pack_row_leave(event):
+    """鼠标离开文件标签时恢复背景色"""
+    if event.widget != selected_label:
+        set_pack_row_color(event.widget, COLORS['background'])
+
+# 所有文件标签共用的事件绑定
+root.bind_class('PackRow', '<Button-1>', on_pack_row_click)
+root.bind_class('PackRowHover', '<Enter>', on_pack_row_enter)
+root.bind_class('PackRowHover', '<Leave>', on_pack_row_leave)
+
+def create_file_label(file_path, lazy=False):
+    """创建一个现代风格的文件标签
+    
+    Args:
+        file_path: 材质包 zip 路径
+        lazy: 为 True 时只创建占位标签，图标和描述稍后由 fill_file_label 填充
+    """
     frame = tk.Frame(frame_file, bg=COLORS['background'], relief='flat')
     frame.pack(fill=tk.X, padx=5, pady=2)
     
     # 添加悬停效果
-    def on_enter(e):
-        if frame != selected_label:
-            frame.configure(bg=COLORS['hover'])
-            for child in frame.winfo_children():
-                child.configure(bg=COLORS['hover'])
-    
-    def on_leave(e):
-        if frame != selected_label:
-            frame.configure(bg=COLORS['background'])
-            for child in frame.winfo_children():
-                child.configure(bg=COLORS['background'])
-    
-    frame.bind('<Enter>', on_enter)
-    frame.bind('<Leave>', on_leave)
+    frame.bindtags(('PackRowHover',) + frame.bindtags())
     
     # 获取zip文件名（不含扩展名）用于到对应的缓存目录
     zip_name = os.path.splitext(os.path.basename(file_path))[0]
-    icon_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name, 'pack.png')
+    frame.pack_root = os.path.join(CACHE_DIR, zip_name)
+    frame.tex_root = os.path.join(frame.pack_root, 'assets', 'minecraft', 'textures')
+    frame.icon_path = os.path.join(frame.pack_root, 'pack.png')
+    frame.mcmeta_path = os.path.join(frame.pack_root, 'pack.mcmeta')
     
-    # 创建图片标签
-    icon_label = tk.Label(frame, background='white')
+    # 创建图片标签（先显示占位图）
+    icon_label = tk.Label(frame, background='white', image=PACK_ICON_PLACEHOLDER)
     icon_label.pack(side=tk.LEFT, padx=5, pady=5)
     
-    # 尝试加载并显示图片
-    try:
-        if os.path.exists(icon_path):
-            # 加载图片并调整大小
-            image = Image.open(icon_path)
-            image = image.resize((64, 64), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
-            icon_label.configure(image=photo)
-            icon_label.image = photo  # 保持引用防止被垃圾回收
-        else:
-            icon_label.configure(width=64, height=64)  # 如果没有图片，保留空间
-    except Exception as e:
-        print(f"加载图片出错：{str(e)}")
-        icon_label.configure(width=64, height=64)  # 加载失败时保留空间
-    
-    # 获取文件名并检查是否有 pack.mcmeta 中的显示名称
-    file_name = os.path.basename(file_path)
-    description = None
-    mcmeta_path = os.path.join(os.path.dirname(__file__), 'packagecache', 
-                              zip_name, 'pack.mcmeta')
-    try:
-        if os.path.exists(mcmeta_path):
-            with open(mcmeta_path, 'r', encoding='utf-8-sig') as f:
-                mcmeta = json.load(f)
-                if 'pack' in mcmeta and 'description' in mcmeta['pack']:
-                    description = mcmeta['pack']['description']
-    except Exception as e:
-        print(f"读取pack.mcmeta出错：{str(e)}")
-    
     # 创一个垂直布局的框架来容纳文件名和描述
     text_frame = tk.Frame(frame, background=COLORS['background'])
     text_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, pady=5)
     
     # 创建文件名标（支持颜色代码）
+    file_name = os.path.basename(file_path)
     name_container = create_colored_text_label(text_frame, file_name)
     name_container.pack(fill=tk.X)
     
-    # 如果有描述，创建描述标签
-    if description:
-        desc_label = tk.Label(text_frame, text=description, fg=COLORS['text_secondary'], background=COLORS['background'])
-        desc_label.pack(fill=tk.X)
-    
-    # 存储完整路径
+    # 存储完整路径，pack.mcmeta 解析后也存在标签上（转换窗口直接使用，不再重新读取）
     frame.full_path = file_path
+    loaded_file_names.add(file_name)
+    frame.mcmeta = None
+    frame.icon_label = icon_label
+    frame.text_frame = text_frame
+    
+    # 框架和所有元素共用 PackRow 标签上的点击事件
+    for widget in (frame, text_frame, icon_label, name_container, *name_container.winfo_children()):
+        add_pack_row_tag(widget)
+    
+    if not lazy:
+        # 尝试加载并显示图片
+        try:
+            photo = get_pack_icon(frame.icon_path, 64)
+        except Exception as e:
+            print(f"加载图片出错：{str(e)}")
+            photo = None
+        fill_file_label(frame, photo, read_pack_mcmeta(frame.mcmeta_path))
+    
+    return frame
+
+def fill_file_label(frame, photo, mcmeta):
+    """把图标和 pack.mcmeta 中的描述填充到文件标签中
+    
+    Args:
+        frame: create_file_label 创建的文件标签
+        photo: 材质包图标，为 None 时保留占位图
+        mcmeta: 解析好的 pack.mcmeta，读取失败时为 None
+    """
+    frame.mcmeta = mcmeta
+    if photo:
+        # PACK_ICON_CACHE 保持着图标的引用，不需要再挂在标签上
+        frame.icon_label.configure(image=photo)
     
-    # 绑定点击事件到有元素
-    def click_handler(event):
-        select_label(frame)
+    # 检查是否有 pack.mcmeta 中的显示名称
+    description = None
+    if mcmeta and 'pack' in mcmeta and 'description' in mcmeta['pack']:
+        description = mcmeta['pack']['description']
     
-    # 绑定点击事件到框架和所有元素
-    frame.bind("<Button-1>", click_handler)
-    text_frame.bind("<Button-1>", click_handler)
-    icon_label.bind("<Button-1>", click_handler)
-    name_container.bind("<Button-1>", click_handler)
+    # 如果有描述，创建描述标签（背景与当前选中/悬停状态保持一致）
     if description:
-        desc_label.bind("<Button-1>", click_handler)
+        desc_label = tk.Label(frame.text_frame, text=description, fg=COLORS['text_secondary'],
+                              background=frame.text_frame.cget('background'))
+        desc_label.pack(fill=tk.X)
+        add_pack_row_tag(desc_label)
+
+def hydrate_file_labels(frames):
+    """在后台线程中解码图标、读取 pack.mcmeta，再回到主线程填充文件标签
     
-    # 为 name_container 中的所有标签也绑定点击事件
-    for widget in name_container.winfo_children():
-        widget.bind("<Button-1>", click_handler)
+    Tk 控件只能在主线程中操作，所以后台线程只把结果放进队列，由主线程定时取出。
+    """
+    jobs = [(frame, frame.icon_path, frame.mcmeta_path) for frame in frames]
+    results = queue.Queue()
     
-    return frame
+    def worker():
+        for frame, icon_path, mcmeta_path in jobs:
+            try:
+                icon = load_pack_icon(icon_path, 64)
+            except Exception as e:
+                print(f"加载图片出错：{str(e)}")
+                icon = None
+            results.put((frame, icon_path, icon, read_pack_mcmeta(mcmeta_path)))
+        results.put(None)
+    
+    def poll():
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                root.after(20, poll)
+                return
+            if item is None:
+                return
+            frame, icon_path, icon, mcmeta = item
+            # 标签可能在加载期间被删除
+            if frame.winfo_exists():
+                photo = get_pack_icon(icon_path, 64, icon) if icon else None
+                fill_file_label(frame, photo, mcmeta)
+    
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
 
 def check_duplicate_file(file_path):
     """检查是否存在同名文件"""
-    new_file_name = os.path.basename(file_path)
-    for widget in frame_file.winfo_children():
-        if isinstance(widget, tk.Frame):
-            existing_path = widget.full_path
-            existing_name = os.path.basename(existing_path)
-            if existing_name == new_file_name:
-                return True
-    return False
+    return os.path.basename(file_path) in loaded_file_names
 
 def select_file():
     file_path = filedialog.askopenfilename(filetypes=[("Zip files", "*.zip"), ("All files", "*.*")])
@@ -603,35 +979,264 @@ def select_file():
             update_delete_button_state()
             save_file_list()
 
+def get_member_path(target_dir, member_name):
+    """计算压缩包内文件解压后的路径（与 zipfile 的处理方式一致，防止路径越界）
+    
+    Args:
+        target_dir: 解压目录
+        member_name: 压缩包内的文件名
+    Returns:
+        str: 解压后的完整路径
+    """
+    arcname = member_name.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    # 去掉盘符和绝对路径、"." 和 ".." 部分
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [x for x in arcname.split(os.path.sep) if x not in ('', os.path.curdir, os.path.pardir)]
+    if os.name == 'nt':
+        # Windows 不允许的字符替换为下划线，并去掉结尾的点
+        table = str.maketrans(':<>|"?*', '_______')
+        parts = [x.translate(table).rstrip('.') for x in parts]
+        parts = [x for x in parts if x]
+    return os.path.join(target_dir, *parts)
+
+def extract_zip_members(zip_path, members, target_dir):
+    """用独立的 ZipFile 句柄解压一批文件（供线程池调用）"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for member in members:
+            member_path = get_member_path(target_dir, member.filename)
+            with zip_ref.open(member) as src, open(member_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+
+def extract_zip_parallel(zip_ref, zip_path, target_dir):
+    """多线程解压整个压缩包
+    
+    Args:
+        zip_ref: 已打开的 ZipFile，用于读取文件列表
+        zip_path: 压缩包路径，每个线程会单独打开
+        target_dir: 解压目录
+    """
+    # 按解压路径去重：重名的文件只解压最后一个（与 extractall 依次覆盖的结果相同），
+    # 避免两个线程同时写入同一个文件
+    members_by_path = {}
+    dirs = set()
+    for member in zip_ref.infolist():
+        member_path = get_member_path(target_dir, member.filename)
+        if member.is_dir():
+            dirs.add(member_path)
+        else:
+            dirs.add(os.path.dirname(member_path))
+            members_by_path[member_path] = member
+    members = list(members_by_path.values())
+    
+    # 先按顺序创建所有目录，避免多个线程同时创建同一个目录
+    for directory in sorted(dirs):
+        os.makedirs(directory, exist_ok=True)
+    
+    # 把文件平均分给各个线程，每个线程使用自己的文件句柄
+    workers = max(1, min(os.cpu_count() or 1, len(members)))
+    chunks = [(zip_path, members[i::workers], target_dir) for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        run_in_parallel(executor, extract_zip_members, chunks)
+
+# 超过这些限制时需要 ZIP64 格式，交给 zipfile 处理
+ZIP_MAX_ENTRIES = 0xFFFF
+ZIP_MAX_TOTAL_SIZE = 1 << 31
+
+# 这些格式本身已经压缩过，再次压缩几乎不会变小，直接存储
+STORED_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.ogg'})
+# 其余文本类文件（json、mcmeta 等）使用最快的压缩等级
+ZIP_COMPRESS_LEVEL = 1
+
+def get_compress_type(arcname):
+    """根据扩展名选择压缩方式"""
+    if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+def get_dos_time(mtime):
+    """把文件修改时间转换为 zip 使用的 DOS 日期和时间"""
+    year, month, day, hour, minute, second = time.localtime(mtime)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+def compress_zip_entry(source, arcname):
+    """读取并压缩单个文件（供线程池调用，zlib 压缩时会释放 GIL）
+
+    磁盘上的文件按 1 MiB 分块读取；直接存储的文件只计算 CRC，内容由写入线程再流式复制，
+    不会把整个文件读入内存。
+
+    Args:
+        source: 文件路径，或者内存中的文件内容（bytes）
+        arcname: 压缩包内的文件名
+    Returns:
+        tuple: (文件名, 压缩方式, CRC32, 原始大小, 压缩后的大小, 压缩后的数据, 文件属性, 修改时间)，
+            磁盘上直接存储的文件压缩后的数据为 None
+    """
+    compress_type = get_compress_type(arcname)
+    deflate = compress_type == zipfile.ZIP_DEFLATED
+    
+    if isinstance(source, bytes):
+        # 内存中的文件与 zipfile.writestr 一样使用当前时间和 0o600 权限
+        compressed = source
+        if deflate:
+            compressor = zlib.compressobj(ZIP_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+            compressed = compressor.compress(source) + compressor.flush()
+        return (arcname, compress_type, zlib.crc32(source), len(source), len(compressed), compressed,
+                0o600, time.time())
+    
+    crc = 0
+    file_size = 0
+    chunks = []
+    buffer = bytearray(COPY_BUFSIZE)
+    view = memoryview(buffer)
+    with open(source, 'rb') as f:
+        st = os.fstat(f.fileno())
+        compressor = zlib.compressobj(ZIP_COMPRESS_LEVEL, zlib.DEFLATED, -15) if deflate else None
+        while True:
+            size = f.readinto(view)
+            if not size:
+                break
+            crc = zlib.crc32(view[:size], crc)
+            file_size += size
+            if compressor:
+                chunks.append(compressor.compress(view[:size]))
+    if compressor:
+        chunks.append(compressor.flush())
+        compressed = b''.join(chunks)
+        return arcname, compress_type, crc, file_size, len(compressed), compressed, st.st_mode, st.st_mtime
+    return arcname, compress_type, crc, file_size, file_size, None, st.st_mode, st.st_mtime
+
+def write_zip_parallel(save_path, file_list, progress_callback=None):
+    """多线程压缩文件并写入 zip（记录格式与 zipfile 生成的一致）
+
+    Args:
+        save_path: 保存的 zip 路径
+        file_list: [(文件路径或文件内容, 压缩包内的文件名), ...]
+        progress_callback: 每写入一个文件调用一次，参数为 (已完成数量, 总数量)
+    """
+    total = len(file_list)
+    total_size = sum(len(source) if isinstance(source, bytes) else os.path.getsize(source)
+                     for source, _ in file_list)
+    if total >= ZIP_MAX_ENTRIES or total_size >= ZIP_MAX_TOTAL_SIZE:
+        # 文件太多或太大时需要 ZIP64，直接使用 zipfile（磁盘上的文件分块流式写入）
+        with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for done, (source, arcname) in enumerate(file_list, 1):
+                compress_type = get_compress_type(arcname)
+                if isinstance(source, bytes):
+                    zipf.writestr(arcname, source, compress_type, ZIP_COMPRESS_LEVEL)
+                else:
+                    zinfo = zipfile.ZipInfo.from_file(source, arcname)
+                    zinfo.compress_type = compress_type
+                    zinfo._compresslevel = ZIP_COMPRESS_LEVEL
+                    with open(source, 'rb') as src, zipf.open(zinfo, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+                if progress_callback:
+                    progress_callback(done, total)
+        return
+
+    create_system = 0 if os.name == 'nt' else 3
+    central_dir = []
+    with open(save_path, 'wb') as f, \
+            ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(compress_zip_entry, source, arcname) for source, arcname in file_list]
+        # 并行压缩，但按 file_list 的顺序写入，同一材质包每次导出的文件顺序相同
+        for done, (source, _) in enumerate(file_list, 1):
+            (arcname, compress_type, crc, file_size, compress_size, compressed,
+             mode, mtime) = futures[done - 1].result()
+            # 写入后立即释放压缩数据
+            futures[done - 1] = None
+            try:
+                filename = arcname.encode('ascii')
+                flag_bits = 0
+            except UnicodeEncodeError:
+                filename = arcname.encode('utf-8')
+                flag_bits = 0x800
+            dos_time, dos_date = get_dos_time(mtime)
+            header_offset = f.tell()
+            f.write(struct.pack(zipfile.structFileHeader, zipfile.stringFileHeader,
+                                20, 0, flag_bits, compress_type, dos_time, dos_date,
+                                crc, compress_size, file_size, len(filename), 0))
+            f.write(filename)
+            if compressed is None:
+                # 直接存储的文件从磁盘流式复制
+                with open(source, 'rb') as src:
+                    shutil.copyfileobj(src, f, COPY_BUFSIZE)
+            else:
+                f.write(compressed)
+            central_dir.append(struct.pack(
+                zipfile.structCentralDir, zipfile.stringCentralDir,
+                20, create_system, 20, 0, flag_bits, compress_type, dos_time, dos_date,
+                crc, compress_size, file_size, len(filename), 0, 0, 0, 0,
+                (mode & 0xFFFF) << 16, header_offset) + filename)
+            if progress_callback:
+                progress_callback(done, total)
+
+        # 写入中央目录和目录结束记录
+        central_dir_offset = f.tell()
+        f.writelines(central_dir)
+        central_dir_size = f.tell() - central_dir_offset
+        f.write(struct.pack(zipfile.structEndArchive, zipfile.stringEndArchive,
+                            0, 0, len(central_dir), len(central_dir),
+                            central_dir_size, central_dir_offset, 0))
+
+def get_cache_stamp_path(cache_dir):
+    """获取记录压缩包信息的文件路径（放在缓存目录旁边，不放进材质包的文件中）"""
+    return cache_dir + '.stamp.json'
+
+def get_zip_stamp(zip_path):
+    """获取压缩包的修改时间和大小，用于判断缓存是否需要更新"""
+    return {'zip_mtime': os.path.getmtime(zip_path), 'zip_size': os.path.getsize(zip_path)}
+
+def is_cache_fresh(zip_path, cache_dir):
+    """检查缓存目录是否由当前的压缩包解压得到"""
+    try:
+        with open(get_cache_stamp_path(cache_dir), 'r', encoding='utf-8') as f:
+            return os.path.isdir(cache_dir) and json.load(f) == get_zip_stamp(zip_path)
+    except (OSError, ValueError):
+        return False
+
 def check_and_extract_zip(zip_path):
+    # 获取zip文件名（含路径和扩展名）
+    zip_name = os.path.splitext(os.path.basename(zip_path))[0]
+    cache_dir = os.path.join(CACHE_DIR, zip_name)
+    
+    # 压缩包没有变化时直接使用已有的缓存，不再重新解压
+    if is_cache_fresh(zip_path, cache_dir):
+        return True
+    
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # 检查是否包含 pack.mcmeta 文件
-            if 'pack.mcmeta' in zip_ref.namelist():
-                # 获取zip文件名（含路径和扩展名）
-                zip_name = os.path.splitext(os.path.basename(zip_path))[0]
-                
-                # 创建缓存目录
-                cache_dir = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name)
-                
-                # 如果目录已存在，先删除
-                if os.path.exists(cache_dir):
-                    shutil.rmtree(cache_dir)
-                
-                # 建新目录并解压
-                os.makedirs(cache_dir)
-                zip_ref.extractall(cache_dir)
-                return True
-            else:
+            # 检查是否包含 pack.mcmeta 文件（直接查中央目录的索引，无需解压或构造文件名列表）
+            try:
+                zip_ref.getinfo('pack.mcmeta')
+            except KeyError:
                 messagebox.showwarning("警告", '找不到"pack.mcmeta"')
                 return False
+            
+            # 如果目录已存在，先删除（连同旧的压缩包信息，解压中断时下次会重新解压）
+            if os.path.exists(get_cache_stamp_path(cache_dir)):
+                os.remove(get_cache_stamp_path(cache_dir))
+            if os.path.exists(cache_dir):
+                shutil.rmtree(cache_dir)
+            
+            # 建新目录并解压
+            os.makedirs(cache_dir)
+            extract_zip_parallel(zip_ref, zip_path, cache_dir)
+            
+            # 解压完成后再记录压缩包信息
+            with open(get_cache_stamp_path(cache_dir), 'w', encoding='utf-8') as f:
+                json.dump(get_zip_stamp(zip_path), f)
+            return True
     except Exception as e:
         messagebox.showerror("错误", f"处理zip文件时出错：{str(e)}")
         return False
 
 # 确保packagecache目录存在
 def ensure_cache_dir():
-    cache_dir = os.path.join(os.path.dirname(__file__), 'packagecache')
+    cache_dir = CACHE_DIR
     if not os.path.exists(cache_dir):
         os.makedirs(cache_dir)
 
@@ -668,27 +1273,15 @@ def select_label(frame):
     
     # 根据当前标签更新贴图显示
     if current_tab:
-        tab_text = current_tab.cget('text')
-        if tab_text == "方块":
-            update_block_textures()
-        elif tab_text == "物品":
-            update_item_textures()
-        elif tab_text == "实体":
-            update_entity_textures()
-        elif tab_text == "界面":
-            update_gui_textures()
-        elif tab_text == "粒子":
-            update_particle_textures()
+        TAB_UPDATERS[current_tab.cget('text')]()
 
 def delete_selected_file():
     global selected_label
     if selected_label:
         # 获取完整文件路径
         file_path = selected_label.full_path
-        # 获取zip文件名（不含路径和扩名）
-        zip_name = os.path.splitext(os.path.basename(file_path))[0]
-        # 构建缓存目录路径
-        cache_dir = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name)
+        # 缓存目录路径
+        cache_dir = selected_label.pack_root
         
         # 在删除之前找到下一个要选择的文件
         next_file = None
@@ -704,11 +1297,14 @@ def delete_selected_file():
         # 如果缓存目录存在，删除它
         if os.path.exists(cache_dir):
             try:
+                if os.path.exists(get_cache_stamp_path(cache_dir)):
+                    os.remove(get_cache_stamp_path(cache_dir))
                 shutil.rmtree(cache_dir)
             except Exception as e:
                 messagebox.showerror("错误", f"删除缓存文件夹时出错：{str(e)}")
         
         # 删除标签
+        loaded_file_names.discard(os.path.basename(file_path))
         selected_label.destroy()
         selected_label = None
         
@@ -728,7 +1324,7 @@ def update_delete_button_state():
 
 def save_file_list():
     """保存文件列表到配置文件"""
-    config_path = os.path.join(os.path.dirname(__file__), 'file_list.json')
+    config_path = os.path.join(APP_DIR, 'file_list.json')
     file_list = []
     for widget in frame_file.winfo_children():
         if isinstance(widget, tk.Frame):
@@ -742,21 +1338,29 @@ def save_file_list():
 
 def load_file_list():
     """从配置文件加载文件列表"""
-    config_path = os.path.join(os.path.dirname(__file__), 'file_list.json')
+    config_path = os.path.join(APP_DIR, 'file_list.json')
     if os.path.exists(config_path):
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
                 file_list = json.load(f)
-                for file_path in file_list:
-                    if os.path.exists(file_path):  # 只加载仍然存在的文件
-                        if check_and_extract_zip(file_path):
-                            create_file_label(file_path)
+            
+            # 先只创建占位标签，让窗口尽快显示
+            frames = []
+            for file_path in file_list:
+                if os.path.exists(file_path):  # 只加载仍然存在的文件
+                    if check_and_extract_zip(file_path):
+                        frames.append(create_file_label(file_path, lazy=True))
+            
+            # 图标和描述在后台加载
+            hydrate_file_labels(frames)
         except Exception as e:
             messagebox.showerror("错误", f"加载配置文件时出错：{str(e)}")
 
 # 添加窗口关闭事件处理
 def on_closing():
     save_file_list()
+    # 退出时不再解码还没显示的缩略图
+    THUMB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
     root.destroy()
 
 # 在主窗口创建后添加这些
@@ -766,35 +1370,10 @@ load_file_list()  # 程序启动时加载文件列表
 # 在 delete_button 之前添加以下函数
 def open_cache_folder():
     """打开应用的缓存文件夹"""
-    cache_dir = os.path.join(os.path.dirname(__file__), 'packagecache')
     try:
-        # Windows系统使用 explorer
-        if os.name == 'nt':
-            os.startfile(cache_dir)
-        # macOS 系统使用 open
-        elif os.name == 'darwin':
-            subprocess.run(['open', cache_dir])
-        # Linux系统使用 xdg-open
-        else:
-            subprocess.run(['xdg-open', cache_dir])
+        open_path(CACHE_DIR)
     except Exception as e:
-        messagebox.showerror("错误", f"无法打开文件夹：{str(e)}")
-
-def get_version_from_pack_format(pack_format):
-    """根据 pack_format 获取对应的版本号"""
-    format_to_version = {
-        6: "1.16.5",
-        7: "1.17.1",
-        8: "1.18.2",
-        9: "1.19.2",
-        12: "1.19.3",
-        13: "1.19.4",
-        15: "1.20.1",
-        18: "1.20.2",
-        26: "1.20.4",
-        30: "1.21"
-    }
-    return format_to_version.get(pack_format)
+        show_toast(f"无法打开文件夹：{str(e)}")
 
 def open_convert_window():
     """打开转换窗口"""
@@ -802,19 +1381,13 @@ def open_convert_window():
         messagebox.showwarning("警告", "请先选择一个材质包")
         return
     
-    # 获取选中文件的信息
-    file_path = selected_label.full_path
-    zip_name = os.path.splitext(os.path.basename(file_path))[0]
-    mcmeta_path = os.path.join(os.path.dirname(__file__), 'packagecache', 
-                              zip_name, 'pack.mcmeta')
-    
-    # 读取 pack.mcmeta 获取 pack_format
+    # 从加载列表时解析好的 pack.mcmeta 获取 pack_format
     current_version = None
     try:
-        with open(mcmeta_path, 'r', encoding='utf-8-sig') as f:
-            mcmeta = json.load(f)
-            pack_format = mcmeta['pack']['pack_format']
-            current_version = get_version_from_pack_format(pack_format)
+        # 图标和描述还在后台加载时，直接读取文件
+        mcmeta = selected_label.mcmeta or read_pack_mcmeta(selected_label.mcmeta_path)
+        pack_format = mcmeta['pack']['pack_format']
+        current_version = PACK_FORMAT_TO_VERSION.get(pack_format)
     except Exception as e:
         print(f"读取pack.mcmeta出错：{str(e)}")
     
@@ -844,8 +1417,7 @@ def open_convert_window():
     
     # 获取选中文件的信息
     file_path = selected_label.full_path
-    zip_name = os.path.splitext(os.path.basename(file_path))[0]
-    icon_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name, 'pack.png')
+    icon_path = selected_label.icon_path
     
     # 创建图片标签
     icon_label = tk.Label(file_frame, bg='white')
@@ -853,12 +1425,9 @@ def open_convert_window():
     
     # 尝试加载并显示图片
     try:
-        if os.path.exists(icon_path):
-            image = Image.open(icon_path)
-            image = image.resize((32, 32), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
+        photo = get_pack_icon(icon_path, 32)
+        if photo:
             icon_label.configure(image=photo)
-            icon_label.image = photo
         else:
             icon_label.configure(width=32, height=32)
     except Exception as e:
@@ -927,52 +1496,28 @@ def open_convert_window():
         scale_factor = int(resolution.replace('x', '')) // 16
         
         # 获取材质包路径
-        source_path = os.path.join(os.path.dirname(__file__), 'packagecache',
-                                  os.path.splitext(os.path.basename(selected_label.full_path))[0])
+        source_path = selected_label.pack_root
     
-        # 创建临时转换目录
-        temp_dir = os.path.join(os.path.dirname(__file__), 'packagecache', 'temp_convert')
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-        
         try:
-            # 复制所有文件到临时目录
-            shutil.copytree(source_path, temp_dir)
-            
-            # 更新进度条
-            progress_bar['value'] = 20
-            convert_window.update_idletasks()
+            # 转换生成的文件只保存在内存中，压缩时直接写入，缓存目录保持不变
+            overrides = {}
             
             # 更新 pack.mcmeta 中的 pack_format
-            mcmeta_path = os.path.join(temp_dir, 'pack.mcmeta')
+            mcmeta_path = os.path.join(source_path, 'pack.mcmeta')
             if os.path.exists(mcmeta_path):
-                with open(mcmeta_path, 'r', encoding='utf-8-sig') as f:
-                    mcmeta = json.load(f)
-                
-                version_format = {
-                    "1.16.5": 6,
-                    "1.17.1": 7,
-                    "1.18.2": 8,
-                    "1.19.2": 9,
-                    "1.19.3": 12,
-                    "1.19.4": 13,
-                    "1.20.1": 15,
-                    "1.20.2": 18,
-                    "1.20.4": 26,
-                    "1.21": 30
-                }
-                
-                mcmeta['pack']['pack_format'] = version_format.get(target, 15)
-                
-                with open(mcmeta_path, 'w', encoding='utf-8') as f:
-                    json.dump(mcmeta, f, indent=4)
+                # 直接解析，格式错误时显示 JSON 的错误信息
+                mcmeta = load_json_bytes(read_file_bytes(mcmeta_path))
+                mcmeta['pack']['pack_format'] = VERSION_FORMAT.get(target, 15)
+                overrides['pack.mcmeta'] = dump_json_bytes(mcmeta)
             
             # 更新进度条
             progress_bar['value'] = 40
             convert_window.update_idletasks()
             
             # 处理版本转换，传入分辨率倍数
-            success, exclude_files = process_version_conversion(source_path, temp_dir, source, target, scale_factor)
+            success, exclude_files = process_version_conversion(source_path, overrides, source, target, scale_factor)
+            # 统一路径写法后转为 frozenset 便于查找
+            exclude_files = frozenset(get_rel_path(file) for file in exclude_files)
             if success:
                 progress_bar['value'] = 80
                 convert_window.update_idletasks()
@@ -986,17 +1531,28 @@ def open_convert_window():
                 )
                 
                 if save_path:
-                    # 创建zip文件，排除指定的文件
-                    with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                        for root, dirs, files in os.walk(temp_dir):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                # 获取相对路径用于检查是否需要排除
-                                rel_path = os.path.relpath(file_path, temp_dir)
-                                rel_path = rel_path.replace('\\', '/')  # 统一使用正斜杠
-                                # 如果文件不在排除列表中，则添加到zip
-                                if rel_path not in exclude_files:
-                                    zipf.write(file_path, rel_path)
+                    # 收集要写入zip的文件，排除指定的文件
+                    # pack.mcmeta 写在最前面，其余转换生成的文件按路径排序（完成顺序不固定）
+                    generated = sorted((rel_path != 'pack.mcmeta', rel_path) for rel_path in overrides
+                                       if rel_path not in exclude_files)
+                    file_list = [(overrides[rel_path], rel_path) for _, rel_path in generated]
+                    for rel_dir, entry in scan_files(source_path):
+                        # 获取相对路径用于检查是否需要排除（统一使用正斜杠）
+                        if rel_dir == '.':
+                            rel_path = entry.name
+                        else:
+                            rel_path = f"{rel_dir.translate(PATH_SEP_TRANS)}/{entry.name}"
+                        # 如果文件不在排除列表中，且没有被转换结果替换，则添加到zip
+                        if rel_path not in exclude_files and rel_path not in overrides:
+                            file_list.append((entry.path, rel_path))
+                    
+                    # 每写入一个文件更新一次进度条（80% 到 100%）
+                    def on_zip_progress(done, total):
+                        progress_bar['value'] = 80 + 20 * done / total
+                        convert_window.update_idletasks()
+                    
+                    # 多线程压缩并创建zip文件
+                    write_zip_parallel(save_path, file_list, on_zip_progress)
                     
                     # 更新进度条到100%
                     progress_bar['value'] = 100
@@ -1008,11 +1564,6 @@ def open_convert_window():
         except Exception as e:
             messagebox.showerror("错误", f"转换过程中出错：{str(e)}")
             convert_window.destroy()
-        
-        finally:
-            # 清理临时目录
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
     
     # 修改确定和取消按钮的样式
     cancel_button = tk.Button(button_frame, text="取消", command=convert_window.destroy)
@@ -1067,71 +1618,8 @@ current_tab = None
 tabs = []
 tab_frames = {}
 
-# 修标签和页面部分的代码
-def create_tab(text, frame_page):
-    """创建现代风格的标签页"""
-    tab = tk.Label(
-        frame_label,
-        text=text,
-        bg=COLORS['background'],
-        fg=COLORS['text'],
-        padx=15,
-        pady=8,
-        font=('Arial', 9)
-    )
-    tab.pack(side=tk.LEFT, padx=2, pady=2)
-    
-    def on_enter(e):
-        if tab != current_tab:
-            tab.configure(fg=COLORS['primary'])
-    
-    def on_leave(e):
-        if tab != current_tab:
-            tab.configure(fg=COLORS['text'])
-    
-    tab.bind('<Enter>', on_enter)
-    tab.bind('<Leave>', on_leave)
-    
-    # 创建对应的内容框架
-    content_frame = tk.Frame(frame_page, bg=COLORS['background'])  # 改为白色背景
-    tab_frames[tab] = content_frame
-    
-    def select_tab(event):
-        global current_tab
-        # 重置所有标签样式
-        for t in tabs:
-            t.configure(bg=COLORS['background'])
-        # 设置当前标签样式
-        tab.configure(bg=COLORS['selected'])
-        # 隐藏所有内容框架
-        for frame in tab_frames.values():
-            frame.pack_forget()
-        # 显示当前标签对应的内容框
-        content_frame.pack(fill=tk.BOTH, expand=True)
-        current_tab = tab
-        
-        # 根据不同标签更新图显示
-        if text == "方块":
-            update_block_textures()
-        elif text == "物品":
-            update_item_textures()
-        elif text == "实体":
-            update_entity_textures()
-        elif text == "界面":
-            update_gui_textures()
-        elif text == "粒子":
-            update_particle_textures()
-    
-    tab.bind('<Button-1>', select_tab)
-    tabs.append(tab)
-    return tab, content_frame
-
-# 在全局变量区域添加
-from tkinter import ttk
-import math
-
 def create_texture_grid(parent_frame):
-    """创建现代风格的贴图网格"""
+    """创建现代风格的贴图网格（所有贴图直接画在一个画布上）"""
     container = tk.Frame(parent_frame, bg=COLORS['background'])
     container.pack(fill=tk.BOTH, expand=True)
     
@@ -1141,8 +1629,14 @@ def create_texture_grid(parent_frame):
         highlightthickness=0
     )
     
-    # 创建用于放置贴图的框架
-    texture_frame = tk.Frame(canvas, bg=COLORS['background'])
+    # 贴图列表和已画出的贴图，画布元素只为可见的行创建
+    canvas.textures = []  # [(完整路径, 显示名称), ...]
+    canvas.texture_index = {}  # {完整路径: 序号}
+    canvas.cells = {}  # {序号: (背景, 图片, 名称) 画布元素}
+    canvas.cell_images = {}  # {序号: PhotoImage}，画布元素不会保留图片的引用
+    canvas.pending = {}  # {缩略图缓存键: (解码任务, 序号)}
+    canvas.polling = False
+    canvas.content_height = 0
     
     # 自定义滚动条样式
     style = ttk.Style()
@@ -1169,206 +1663,108 @@ def create_texture_grid(parent_frame):
         command=canvas.xview
     )
     
-    canvas.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+    # 滚动或改变大小时画出新出现的行
+    def on_yscroll(first, last):
+        scrollbar_y.set(first, last)
+        show_visible_textures(canvas)
+    
+    canvas.configure(yscrollcommand=on_yscroll, xscrollcommand=scrollbar_x.set)
     
     # 打包滚动条和画布
     scrollbar_y.pack(side="right", fill="y")
     scrollbar_x.pack(side="bottom", fill="x")
     canvas.pack(side="left", fill="both", expand=True)
     
-    # 在画布上创建窗口来显示框架
-    canvas.create_window((0, 0), window=texture_frame, anchor="nw")
-    
-    # 配置滚动区域
-    def on_frame_configure(event):
-        canvas.configure(scrollregion=canvas.bbox("all"))
-    texture_frame.bind("<Configure>", on_frame_configure)
+    # 点击、双击和右键事件绑定在所有贴图元素共有的 cell 标签上
+    canvas.tag_bind('cell', '<Button-1>', lambda e: on_texture_click(e))
+    canvas.tag_bind('cell', '<Double-Button-1>', lambda e: on_texture_double_click(e))
+    canvas.tag_bind('cell', '<Button-3>', lambda e: on_texture_right_click(e))
     
     # 添加鼠标滚轮支持
     def on_mousewheel(event):
         # 确保内容超显示区域时才滚动
-        if texture_frame.winfo_reqheight() > canvas.winfo_height():
+        if canvas.content_height > canvas.winfo_height():
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
     
-    # 将滚轮事件绑定到画布和texture_frame上
+    # 将滚轮事件绑定到画布上
     canvas.bind_all("<MouseWheel>", on_mousewheel)
     canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_mousewheel))
     canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
     
-    return texture_frame
+    return canvas
 
-def load_textures(frame, texture_path, search_text=""):
-    """统一的贴图加载函数"""
-    # 清除现有的贴图
-    for widget in frame.winfo_children():
-        widget.destroy()
-    
-    if not os.path.exists(texture_path):
-        return
-    
-    # 收集所有贴图（包括子文件夹）
-    all_textures = []
-    for root, dirs, files in os.walk(texture_path):
-        for file in files:
-            if file.endswith(('.png', '.jpg', '.jpeg')):
-                # 获取相对路径
-                rel_path = os.path.relpath(root, texture_path)
-                if rel_path == '.':
-                    texture_name = file
-                else:
-                    texture_name = os.path.join(rel_path, file)
-                
-                # 如果有搜索文本，进行过滤
-                if not search_text or search_text.lower() in texture_name.lower():
-                    full_path = os.path.join(root, file)
-                    all_textures.append((full_path, texture_name))
-    
-    # 计算每行显示的图片数量
-    frame_width = 900
-    item_width = 100
-    columns = max(1, frame_width // item_width)
-    
-    # 创建网格布局
-    for index, (full_path, texture_name) in enumerate(all_textures):
-        row = index // columns
-        col = index % columns
-        
-        # 创建图片容器
-        item_frame = tk.Frame(frame, bg=COLORS['background'])
-        item_frame.grid(row=row, column=col, padx=5, pady=5)
-        
-        try:
-            # 加载并显示图片
-            image = Image.open(full_path)
-            image = image.resize((64, 64), Image.Resampling.NEAREST)
-            photo = ImageTk.PhotoImage(image)
-            
-            # 创建图片标签
-            img_label = tk.Label(item_frame, image=photo, bg=COLORS['background'])
-            img_label.image = photo
-            img_label.pack()
-            
-            # 创建文件名标签
-            name_label = tk.Label(item_frame, text=texture_name, fg=COLORS['text'], bg=COLORS['background'],
-                                wraplength=90)
-            name_label.pack()
-            
-            # 绑定点击和右键事件
-            for widget in [item_frame, img_label, name_label]:
-                widget.bind('<Button-1>', 
-                          lambda e, f=item_frame, p=full_path: select_texture(e, f, p))
-                widget.bind('<Double-Button-1>', 
-                          lambda e, p=full_path: replace_texture(e, p))
-                widget.bind('<Button-3>', 
-                          lambda e, p=full_path: show_context_menu(e, p))
-            
-        except Exception as e:
-            print(f"加载贴图出错 {texture_name}: {str(e)}")
+# 在全局变量区域添加
+entity_texture_frame = None
+
+# 在全局变量区域添加
+gui_texture_frame = None
+
+# 在全局变量区域添加
+particle_texture_frame = None
 
 def update_block_textures():
     """更新方块贴图显示"""
     if not selected_label or not current_tab:
         return
     
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    texture_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                               'assets', 'minecraft', 'textures', 'block')
-    load_textures(block_texture_frame, texture_path, current_search_text)
+    load_textures(block_texture_frame, os.path.join(selected_label.tex_root, 'block'), current_search_text)
 
 def update_item_textures():
     """更新物品贴图显示"""
     if not selected_label or not current_tab:
         return
     
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    texture_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                               'assets', 'minecraft', 'textures', 'item')
-    load_textures(item_texture_frame, texture_path, current_search_text)
+    load_textures(item_texture_frame, os.path.join(selected_label.tex_root, 'item'), current_search_text)
 
-# 在全局变量区域添加
-entity_texture_frame = None
-
-# 在全局变量区域添加
-gui_texture_frame = None
+def update_entity_textures():
+    """更新实体贴图显示"""
+    if not selected_label or not current_tab:
+        return
+        
+    load_textures(entity_texture_frame, os.path.join(selected_label.tex_root, 'entity'), current_search_text)
 
-# 在全局变量区域添加
-particle_texture_frame = None
+def update_gui_textures():
+    """更新界面贴图显示"""
+    if not selected_label or not current_tab:
+        return
+        
+    load_textures(gui_texture_frame, os.path.join(selected_label.tex_root, 'gui'), current_search_text)
 
-# 在 create_tab 数之前添加 update_particle_textures 函数
 def update_particle_textures():
     """更新粒子贴图显示"""
     if not selected_label or not current_tab:
         return
         
-    # 获取选中的材质包路径
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    base_particle_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                                   'assets', 'minecraft', 'textures', 'particle')
-    
-    # 收集所有粒子贴图（包括子文件夹）
-    all_textures = []
-    if os.path.exists(base_particle_path):
-        for root, dirs, files in os.walk(base_particle_path):
-            for file in files:
-                if file.endswith(('.png', '.jpg', '.jpeg')):
-                    # 获取相对于particle文件夹的路径
-                    rel_path = os.path.relpath(root, base_particle_path)
-                    if rel_path == '.':
-                        # 如果在particle文件夹根目录
-                        texture_name = file
-                    else:
-                        # 如果在子文件夹中
-                        texture_name = os.path.join(rel_path, file)
-                    all_textures.append((os.path.join(root, file), texture_name))
-    
-    # 清除现有的贴图
-    for widget in particle_texture_frame.winfo_children():
-        widget.destroy()
-    
-    # 计算每行显示的图片数量
-    frame_width = 900
-    item_width = 100
-    columns = max(1, frame_width // item_width)
-    
-    # 创建网格布局
-    for index, (full_path, texture_name) in enumerate(all_textures):
-        if current_search_text and current_search_text.lower() not in texture_name.lower():
-            continue
-            
-        row = index // columns
-        col = index % columns
-        
-        # 创建图片容器
-        item_frame = tk.Frame(particle_texture_frame, bg=COLORS['background'])
-        item_frame.grid(row=row, column=col, padx=5, pady=5)
-        
-        try:
-            # 加载并显示图片
-            image = Image.open(full_path)
-            image = image.resize((64, 64), Image.Resampling.NEAREST)
-            photo = ImageTk.PhotoImage(image)
-            
-            # 创建图片标签
-            img_label = tk.Label(item_frame, image=photo, bg=COLORS['background'])
-            img_label.image = photo
-            img_label.pack()
-            
-            # 创建文件名标签
-            name_label = tk.Label(item_frame, text=texture_name, fg=COLORS['text'], bg=COLORS['background'],
-                                wraplength=90)
-            name_label.pack()
-            
-            # 绑定点击和双击事件
-            for widget in [item_frame, img_label, name_label]:
-                widget.bind('<Button-1>', 
-                          lambda e, f=item_frame, p=full_path: select_texture(e, f, p))
-                widget.bind('<Double-Button-1>', 
-                          lambda e, p=full_path: replace_texture(e, p))
-            
-        except Exception as e:
-            print(f"加载贴图出错 {texture_name}: {str(e)}")
+    load_textures(particle_texture_frame, os.path.join(selected_label.tex_root, 'particle'), current_search_text)
+
+# 各标签页对应的贴图更新函数
+TAB_UPDATERS = {
+    "方块": update_block_textures,
+    "物品": update_item_textures,
+    "实体": update_entity_textures,
+    "界面": update_gui_textures,
+    "粒子": update_particle_textures
+}
+
+def activate_tab(index):
+    """选中第 index 个标签页，显示对应的内容并更新贴图"""
+    global current_tab
+    tab = tabs[index]
+    # 重置所有标签样式
+    for t in tabs:
+        t.configure(bg=COLORS['background'])
+    # 设置当前标签样式
+    tab.configure(bg=COLORS['selected'])
+    # 隐藏所有内容框架
+    for frame in tab_frames.values():
+        frame.pack_forget()
+    # 显示当前标签对应的内容框
+    tab_frames[tab].pack(fill=tk.BOTH, expand=True)
+    current_tab = tab
+    
+    # 根据不同标签更新图显示
+    TAB_UPDATERS[tab.cget('text')]()
 
-# 然是 create_tab 函数
 def create_tab(text, frame_page):
     """创建现代风格的标签页"""
     tab = tk.Label(
@@ -1397,33 +1793,8 @@ def create_tab(text, frame_page):
     content_frame = tk.Frame(frame_page, bg=COLORS['background'])  # 改为白色背景
     tab_frames[tab] = content_frame
     
-    def select_tab(event):
-        global current_tab
-        # 重置所有标签样式
-        for t in tabs:
-            t.configure(bg=COLORS['background'])
-        # 设置当前标签样式
-        tab.configure(bg=COLORS['selected'])
-        # 隐藏所有内容框架
-        for frame in tab_frames.values():
-            frame.pack_forget()
-        # 显示当前标签对应的内容框
-        content_frame.pack(fill=tk.BOTH, expand=True)
-        current_tab = tab
-        
-        # 根据不同标签更新图显示
-        if text == "方块":
-            update_block_textures()
-        elif text == "物品":
-            update_item_textures()
-        elif text == "实体":
-            update_entity_textures()
-        elif text == "界面":
-            update_gui_textures()
-        elif text == "粒子":
-            update_particle_textures()
-    
-    tab.bind('<Button-1>', select_tab)
+    index = len(tabs)
+    tab.bind('<Button-1>', lambda e: activate_tab(index))
     tabs.append(tab)
     return tab, content_frame
 
@@ -1441,74 +1812,55 @@ entity_texture_frame = create_texture_grid(frame4)
 gui_texture_frame = create_texture_grid(frame6)
 particle_texture_frame = create_texture_grid(frame7)
 
-# 默认选中第一个标签
-if tabs:
-    tabs[0].event_generate('<Button-1>')
-
 # 在全局变量区域添加
-selected_textures = set()  # 存储选中的贴图
+selected_textures = set()  # 存储选中的贴图路径
 last_selected_texture = None  # 用于shift选
+selected_texture_grid = None  # 选中的贴图所在的网格
+
+def refresh_texture_selection(grid):
+    """按选择状态更新已画出的贴图的背景色"""
+    for index, (background, _, _) in grid.cells.items():
+        selected = grid.textures[index][0] in selected_textures
+        grid.itemconfigure(background, fill=COLORS['selected'] if selected else COLORS['background'])
 
-def select_texture(event, item_frame, texture_path):
+def select_texture(event, grid, texture_path):
     """处理贴图的选择逻辑"""
-    global last_selected_texture
+    global last_selected_texture, selected_texture_grid
     
-    # 获取所有贴图框架
-    all_texture_frames = [w for w in item_frame.master.winfo_children() 
-                         if isinstance(w, tk.Frame)]
+    # 在另一个标签页中选择时，清除之前的选择
+    if grid is not selected_texture_grid:
+        selected_textures.clear()
+        if selected_texture_grid is not None:
+            refresh_texture_selection(selected_texture_grid)
+        selected_texture_grid = grid
     
     if event.state & 0x4:  # Ctrl被按下
         # 切换选择状态
-        if item_frame in selected_textures:
-            selected_textures.remove(item_frame)
-            item_frame.configure(bg=COLORS['background'])
-            for widget in item_frame.winfo_children():
-                widget.configure(bg=COLORS['background'])
+        if texture_path in selected_textures:
+            selected_textures.remove(texture_path)
         else:
-            selected_textures.add(item_frame)
-            item_frame.configure(bg=COLORS['selected'])
-            for widget in item_frame.winfo_children():
-                widget.configure(bg=COLORS['selected'])
-        last_selected_texture = item_frame
+            selected_textures.add(texture_path)
+        last_selected_texture = texture_path
         
     elif event.state & 0x1:  # Shift按
-        if last_selected_texture:
+        if last_selected_texture in grid.texture_index:
             # 获取当前和上次选择的索引
-            current_idx = all_texture_frames.index(item_frame)
-            last_idx = all_texture_frames.index(last_selected_texture)
-            
-            # 清除之前的选择
-            selected_textures.clear()
-            for frame in all_texture_frames:
-                frame.configure(bg=COLORS['background'])
-                for widget in frame.winfo_children():
-                    widget.configure(bg=COLORS['background'])
+            current_idx = grid.texture_index[texture_path]
+            last_idx = grid.texture_index[last_selected_texture]
             
-            # 选择范围内的所有贴图
+            # 清除之前的选择，选择范围内的所有贴图
             start_idx = min(current_idx, last_idx)
             end_idx = max(current_idx, last_idx) + 1
-            for idx in range(start_idx, end_idx):
-                frame = all_texture_frames[idx]
-                selected_textures.add(frame)
-                frame.configure(bg=COLORS['selected'])
-                for widget in frame.winfo_children():
-                    widget.configure(bg=COLORS['selected'])
+            selected_textures.clear()
+            selected_textures.update(path for path, _ in grid.textures[start_idx:end_idx])
     
     else:  # 普通点击
-        # 清除之前的选择
+        # 清除之前的选择，选择当前贴图
         selected_textures.clear()
-        for frame in all_texture_frames:
-            frame.configure(bg=COLORS['background'])
-            for widget in frame.winfo_children():
-                widget.configure(bg=COLORS['background'])
-        
-        # 选择当前贴图
-        selected_textures.add(item_frame)
-        item_frame.configure(bg=COLORS['selected'])
-        for widget in item_frame.winfo_children():
-            widget.configure(bg=COLORS['selected'])
-        last_selected_texture = item_frame
+        selected_textures.add(texture_path)
+        last_selected_texture = texture_path
     
+    refresh_texture_selection(grid)
     update_delete_texture_button_state()
 
 def replace_texture(event, texture_path):
@@ -1518,8 +1870,12 @@ def replace_texture(event, texture_path):
     )
     if new_texture:
         try:
+            # 新贴图与原贴图内容相同时不需要复制和刷新
+            if os.path.exists(texture_path) and filecmp.cmp(new_texture, texture_path, shallow=False):
+                return
             # 复制新贴图到原位置
-            shutil.copy2(new_texture, texture_path)
+            copy_file(new_texture, texture_path)
+            invalidate_texture_thumb(texture_path)
             # 更新显示
             update_block_textures()
         except Exception as e:
@@ -1531,27 +1887,22 @@ def delete_selected_textures():
         return
         
     if messagebox.askyesno("确认", "确定要删除选的贴图吗？"):
-        for item_frame in selected_textures:
+        deleted = set()
+        for texture_path in selected_textures:
             try:
-                # 获取贴图文件名
-                filename = item_frame.winfo_children()[-1].cget("text")
-                # 获取完整路径
-                texture_path = os.path.join(
-                    os.path.dirname(__file__), 
-                    'packagecache',
-                    os.path.splitext(os.path.basename(selected_label.full_path))[0],
-                    'assets', 'minecraft', 'textures', 'block',
-                    filename
-                )
                 # 删除文件
                 if os.path.exists(texture_path):
                     os.remove(texture_path)
-                # 删除界面示
-                item_frame.destroy()
+                deleted.add(texture_path)
+                invalidate_texture_list(texture_path)
             except Exception as e:
                 messagebox.showerror("错误", f"删除贴图时出错：{str(e)}")
         
+        # 从列表中移除已删除的贴图并重新排列
+        grid = selected_texture_grid
+        grid.textures = [texture for texture in grid.textures if texture[0] not in deleted]
         selected_textures.clear()
+        layout_texture_grid(grid)
         update_delete_texture_button_state()
 
 def update_delete_texture_button_state():
@@ -1561,74 +1912,245 @@ def update_delete_texture_button_state():
     else:
         delete_texture_button.config(state=tk.DISABLED)
 
-# 修改 load_textures 函数
-def load_textures(frame, texture_path, search_text=""):
-    """统一的贴图加载函数"""
-    # 清除现有的贴图
-    for widget in frame.winfo_children():
-        widget.destroy()
+# 贴图缩略图缓存 {(路径, 修改时间, 文件大小): PhotoImage}，超出上限时淘汰最久未使用的
+THUMB_CACHE = collections.OrderedDict()
+THUMB_CACHE_SIZE = 4000
+
+# 解码缩略图的线程池（PIL 解码时会释放 GIL），PhotoImage 只能在主线程中创建
+THUMB_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+def get_thumb_key(full_path):
+    """获取贴图缩略图的缓存键 (路径, 修改时间, 文件大小)"""
+    st = os.stat(full_path)
+    return full_path, st.st_mtime_ns, st.st_size
+
+def get_cached_thumb(key):
+    """从缓存中获取缩略图，没有时返回 None"""
+    photo = THUMB_CACHE.get(key)
+    if photo is not None:
+        THUMB_CACHE.move_to_end(key)
+    return photo
+
+def decode_texture_thumb(full_path):
+    """解码贴图并缩放为 64x64（供线程池调用）"""
+    with Image.open(full_path) as image:
+        # 本来就是 64x64 的贴图不需要缩放，只解码
+        if image.size == (64, 64):
+            image.load()
+            return image
+        return image.resize((64, 64), Image.Resampling.NEAREST)
+
+def cache_texture_thumb(key, image):
+    """创建缩略图的 PhotoImage 并加入缓存（必须在主线程中调用）"""
+    photo = ImageTk.PhotoImage(image)
+    THUMB_CACHE[key] = photo
+    if len(THUMB_CACHE) > THUMB_CACHE_SIZE:
+        THUMB_CACHE.popitem(last=False)
+    return photo
+
+def invalidate_texture_thumb(full_path):
+    """移除贴图的缩略图缓存（替换文件时会保留新文件的修改时间，不能只靠修改时间判断）"""
+    for key in [key for key in THUMB_CACHE if key[0] == full_path]:
+        del THUMB_CACHE[key]
+
+# 贴图网格的布局：每格的大小，以及可见区域上下额外创建的行数
+TEXTURE_COLUMNS = 9
+TEXTURE_CELL_WIDTH = 100
+TEXTURE_CELL_HEIGHT = 120
+TEXTURE_PREFETCH_ROWS = 2
+
+def create_texture_cell(grid, index):
+    """在画布上画出单个贴图（缩略图没有缓存时先显示占位图，在线程池中解码）
     
-    if not os.path.exists(texture_path):
-        return
+    Returns:
+        tuple: (背景, 图片, 名称) 画布元素
+    """
+    full_path, texture_name = grid.textures[index]
+    row, col = divmod(index, TEXTURE_COLUMNS)
+    x = col * TEXTURE_CELL_WIDTH + 5
+    y = row * TEXTURE_CELL_HEIGHT + 5
+    center = x + (TEXTURE_CELL_WIDTH - 10) // 2
     
-    # 收集所有贴图（包括子文件夹）
-    all_textures = []
-    for root, dirs, files in os.walk(texture_path):
-        for file in files:
-            if file.endswith(('.png', '.jpg', '.jpeg')):
-                # 获取相对路径
-                rel_path = os.path.relpath(root, texture_path)
-                if rel_path == '.':
-                    texture_name = file
-                else:
-                    texture_name = os.path.join(rel_path, file)
-                
-                # 如果有搜索文本，进行过滤
-                if not search_text or search_text.lower() in texture_name.lower():
-                    full_path = os.path.join(root, file)
-                    all_textures.append((full_path, texture_name))
-    
-    # 计算每行显示的图片数量
-    frame_width = 900
-    item_width = 100
-    columns = max(1, frame_width // item_width)
-    
-    # 创建网格布局
-    for index, (full_path, texture_name) in enumerate(all_textures):
-        row = index // columns
-        col = index % columns
-        
-        # 创建图片容器
-        item_frame = tk.Frame(frame, bg=COLORS['background'])
-        item_frame.grid(row=row, column=col, padx=5, pady=5)
-        
+    photo = PACK_ICON_PLACEHOLDER
+    try:
+        # 优先使用缓存的缩略图
+        key = get_thumb_key(full_path)
+        cached = get_cached_thumb(key)
+        if cached is not None:
+            photo = cached
+        elif key not in grid.pending:
+            grid.pending[key] = (THUMB_EXECUTOR.submit(decode_texture_thumb, full_path), index)
+    except Exception as e:
+        print(f"加载贴图出错 {texture_name}: {str(e)}")
+    grid.cell_images[index] = photo
+    
+    # 背景（显示选中状态）、图片和文件名
+    selected = full_path in selected_textures
+    background = grid.create_rectangle(
+        x, y, x + TEXTURE_CELL_WIDTH - 10, y + TEXTURE_CELL_HEIGHT - 10,
+        fill=COLORS['selected'] if selected else COLORS['background'], width=0, tags='cell')
+    image = grid.create_image(center, y, image=photo, anchor='n', tags='cell')
+    name = grid.create_text(center, y + 66, text=texture_name, fill=COLORS['text'],
+                            width=90, anchor='n', justify='center', tags='cell')
+    return background, image, name
+
+def get_clicked_texture(event):
+    """根据鼠标位置计算点击的贴图路径"""
+    grid = event.widget
+    col = int(grid.canvasx(event.x) // TEXTURE_CELL_WIDTH)
+    index = int(grid.canvasy(event.y) // TEXTURE_CELL_HEIGHT) * TEXTURE_COLUMNS + col
+    if col < TEXTURE_COLUMNS and index < len(grid.textures):
+        return grid.textures[index][0]
+    return None
+
+def on_texture_click(event):
+    """单击贴图：选择"""
+    texture_path = get_clicked_texture(event)
+    if texture_path:
+        select_texture(event, event.widget, texture_path)
+
+def on_texture_double_click(event):
+    """双击贴图：替换"""
+    texture_path = get_clicked_texture(event)
+    if texture_path:
+        replace_texture(event, texture_path)
+
+def on_texture_right_click(event):
+    """右键贴图：显示菜单"""
+    texture_path = get_clicked_texture(event)
+    if texture_path:
+        show_context_menu(event, texture_path)
+
+def show_decoded_thumbs(grid):
+    """在主线程中显示已解码完成的缩略图"""
+    for key, (future, index) in list(grid.pending.items()):
+        if not future.done():
+            continue
+        del grid.pending[key]
         try:
-            # 加载并显示图片
-            image = Image.open(full_path)
-            image = image.resize((64, 64), Image.Resampling.NEAREST)
-            photo = ImageTk.PhotoImage(image)
-            
-            # 创建图片标签
-            img_label = tk.Label(item_frame, image=photo, bg=COLORS['background'])
-            img_label.image = photo
-            img_label.pack()
-            
-            # 创建文件名标签
-            name_label = tk.Label(item_frame, text=texture_name, fg=COLORS['text'], bg=COLORS['background'],
-                                wraplength=90)
-            name_label.pack()
-            
-            # 绑定点击和右键事件
-            for widget in [item_frame, img_label, name_label]:
-                widget.bind('<Button-1>', 
-                          lambda e, f=item_frame, p=full_path: select_texture(e, f, p))
-                widget.bind('<Double-Button-1>', 
-                          lambda e, p=full_path: replace_texture(e, p))
-                widget.bind('<Button-3>', 
-                          lambda e, p=full_path: show_context_menu(e, p))
-            
+            photo = cache_texture_thumb(key, future.result())
         except Exception as e:
-            print(f"加载贴图出错 {texture_name}: {str(e)}")
+            print(f"加载贴图出错 {key[0]}: {str(e)}")
+            continue
+        # 贴图可能已经滚出可见区域被删除
+        cell = grid.cells.get(index)
+        if cell:
+            grid.itemconfigure(cell[1], image=photo)
+            grid.cell_images[index] = photo
+    
+    if grid.pending:
+        root.after(10, show_decoded_thumbs, grid)
+    else:
+        grid.polling = False
+
+def show_visible_textures(grid):
+    """只画出可见区域（及上下几行）的贴图，删除离开可见区域的贴图"""
+    top = grid.canvasy(0)
+    first_row = max(0, int(top // TEXTURE_CELL_HEIGHT) - TEXTURE_PREFETCH_ROWS)
+    last_row = int((top + grid.winfo_height()) // TEXTURE_CELL_HEIGHT) + TEXTURE_PREFETCH_ROWS
+    start = first_row * TEXTURE_COLUMNS
+    end = min(len(grid.textures), (last_row + 1) * TEXTURE_COLUMNS)
+    
+    for index in [index for index in grid.cells if not start <= index < end]:
+        grid.delete(*grid.cells.pop(index))
+        del grid.cell_images[index]
+    for index in range(start, end):
+        if index not in grid.cells:
+            grid.cells[index] = create_texture_cell(grid, index)
+    
+    if grid.pending and not grid.polling:
+        grid.polling = True
+        root.after(10, show_decoded_thumbs, grid)
+
+def layout_texture_grid(grid):
+    """按 grid.textures 重新排列贴图网格"""
+    # 清除现有的贴图，取消还没完成的缩略图解码
+    grid.delete('cell')
+    grid.cells.clear()
+    grid.cell_images.clear()
+    for future, _ in grid.pending.values():
+        future.cancel()
+    grid.pending.clear()
+    
+    grid.texture_index = {full_path: index for index, (full_path, _) in enumerate(grid.textures)}
+    # 按全部贴图的行数设置滚动区域，使滚动条与完整列表一致
+    rows = math.ceil(len(grid.textures) / TEXTURE_COLUMNS)
+    grid.content_height = rows * TEXTURE_CELL_HEIGHT
+    grid.configure(scrollregion=(0, 0, TEXTURE_COLUMNS * TEXTURE_CELL_WIDTH, grid.content_height))
+    show_visible_textures(grid)
+
+# 贴图目录的扫描结果缓存 {贴图目录: ({子目录: 修改时间}, [(完整路径, 显示名称, 用于搜索的名称), ...])}
+WALK_CACHE = {}
+
+# 贴图列表中显示的图片格式
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg'})
+
+def list_textures(texture_path):
+    """列出目录下（包括子文件夹）的所有贴图，各级目录都没有变化时直接使用缓存
+    
+    Args:
+        texture_path: 贴图目录
+    Returns:
+        list: [(完整路径, 显示名称, casefold 后的显示名称), ...]
+    """
+    cached = WALK_CACHE.get(texture_path)
+    if cached:
+        dir_mtimes, textures = cached
+        try:
+            if all(os.stat(directory).st_mtime_ns == mtime for directory, mtime in dir_mtimes.items()):
+                return textures
+        except OSError:
+            pass
+    
+    dir_mtimes = {}
+    textures = []
+    
+    def scan(directory, rel_dir, mtime):
+        """用 os.scandir 扫描目录（DirEntry 自带文件类型，不需要额外的 stat），先列文件再进入子文件夹"""
+        dir_mtimes[directory] = mtime
+        sub_dirs = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry)
+                elif entry.is_file(follow_symlinks=False):
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot >= 0 and name[dot:].lower() in IMAGE_EXTENSIONS:
+                        texture_name = os.path.join(rel_dir, name) if rel_dir else name
+                        textures.append((entry.path, texture_name, texture_name.casefold()))
+        for entry in sub_dirs:
+            scan(entry.path, os.path.join(rel_dir, entry.name) if rel_dir else entry.name,
+                 entry.stat(follow_symlinks=False).st_mtime_ns)
+    
+    scan(texture_path, '', os.stat(texture_path).st_mtime_ns)
+    WALK_CACHE[texture_path] = (dir_mtimes, textures)
+    return textures
+
+def invalidate_texture_list(texture_path):
+    """移除包含该贴图的目录的扫描结果缓存"""
+    for folder in [folder for folder in WALK_CACHE if texture_path.startswith(folder + os.sep)]:
+        del WALK_CACHE[folder]
+
+# 修改 load_textures 函数
+def load_textures(frame, texture_path, search_text=""):
+    """统一的贴图加载函数（只收集贴图列表，控件在显示到可见区域时才创建）"""
+    global selected_texture_grid
+    # 重新加载时清除该网格中的选择
+    if frame is selected_texture_grid:
+        selected_textures.clear()
+        selected_texture_grid = None
+        update_delete_texture_button_state()
+    
+    # 收集所有贴图（包括子文件夹），如果有搜索文本，进行过滤
+    all_textures = []
+    if os.path.exists(texture_path):
+        needle = search_text.casefold()
+        all_textures = [(full_path, texture_name) for full_path, texture_name, folded in list_textures(texture_path)
+                        if needle in folded]
+    
+    frame.textures = all_textures
+    layout_texture_grid(frame)
 
 # 修改操作框架部分的代码，添删除贴图按钮
 delete_texture_button = tk.Button(frame_operate, text="删除贴图", 
@@ -1688,28 +2210,29 @@ def create_search_widgets(frame_operate):
         font=('Microsoft YaHei', 9)  # 设置字体为微软雅黑
     )
     
-    def on_search_change(*args):
-        """当搜索文本改变时触发"""
+    # 等待执行的搜索（停止输入 150ms 后才更新贴图，连续输入时只更新一次）
+    search_after_id = None
+    
+    def apply_search():
+        """按当前的搜索文本更新贴图显示"""
         global current_search_text
-        search_text = search_var.get().lower()
-        current_search_text = search_text
+        nonlocal search_after_id
+        search_after_id = None
+        current_search_text = search_var.get().lower()
         
         # 根据当前标签更新显示
         if current_tab:
-            tab_text = current_tab.cget('text')
-            if tab_text == "方块":
-                update_block_textures()
-            elif tab_text == "物品":
-                update_item_textures()
-            elif tab_text == "实体":
-                update_entity_textures()
-            elif tab_text == "界面":
-                update_gui_textures()
-            elif tab_text == "粒子":
-                update_particle_textures()
+            TAB_UPDATERS[current_tab.cget('text')]()
+    
+    def on_search_change(*args):
+        """当搜索文本改变时触发"""
+        nonlocal search_after_id
+        if search_after_id:
+            root.after_cancel(search_after_id)
+        search_after_id = root.after(150, apply_search)
         
         # 更新清除按钮显示状态
-        if search_text:
+        if search_var.get():
             clear_button.pack(side=tk.RIGHT, in_=entry_container)
         else:
             clear_button.pack_forget()
@@ -1729,76 +2252,34 @@ def create_search_widgets(frame_operate):
     
     return search_entry
 
-def perform_search(search_text):
-    """执行搜索"""
-    if not selected_label:
-        return
-        
-    # 获取选中的材质包路径
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    base_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                            'assets', 'minecraft', 'textures')
-    
-    # 确定搜索范围
-    if current_tab and current_tab.cget('text') == "方块":
-        if "block" in root_path:
-            load_textures(block_texture_frame, root_path, search_text)
-    # 为其他标签页添加类似的处理...
-
-# 修改 update_block_textures 函数
-def update_block_textures():
-    """更新方块贴图显示"""
-    if not selected_label or not current_tab:
-        return
-    
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    texture_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                               'assets', 'minecraft', 'textures', 'block')
-    load_textures(block_texture_frame, texture_path, current_search_text)
-
 # 在创建操作框架的分添加搜索控件
 # 创建搜索控件
 search_entry = create_search_widgets(frame_operate)
 
-# 添加更新实体贴图的函数
-def update_entity_textures():
-    """更新实体贴图显示"""
-    if not selected_label or not current_tab:
-        return
-        
-    # 获取选中的材质包路
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    texture_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                               'assets', 'minecraft', 'textures', 'entity')
-    load_textures(entity_texture_frame, texture_path, current_search_text)
-
-# 添加更新界面贴图的函数
-def update_gui_textures():
-    """更新界面贴图显示"""
-    if not selected_label or not current_tab:
-        return
-        
-    # 获取选中的材质包路径
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    texture_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                               'assets', 'minecraft', 'textures', 'gui')
-    load_textures(gui_texture_frame, texture_path, current_search_text)
-
-# 添加更新粒子贴图的函数
-def update_particle_textures():
-    """更新粒子贴图显示"""
-    if not selected_label or not current_tab:
-        return
-        
-    # 获取选中的材质包路径
-    zip_name = os.path.splitext(os.path.basename(selected_label.full_path))[0]
-    texture_path = os.path.join(os.path.dirname(__file__), 'packagecache', zip_name,
-                               'assets', 'minecraft', 'textures', 'particle')
-    load_textures(particle_texture_frame, texture_path, current_search_text)
-
 # 添加剪贴板和系统打开文件的支持
-def create_context_menu(parent, texture_path):
-    """创建现代风格的右键菜单"""
+def show_toast(message, duration=2000):
+    """在主窗口底部显示一条自动消失的提示（不是模态对话框，不会阻塞界面）
+    
+    Args:
+        message: 提示内容
+        duration: 显示时间（毫秒）
+    """
+    toast = tk.Toplevel(root)
+    toast.overrideredirect(True)
+    toast.attributes('-topmost', True)
+    tk.Label(toast, text=message, bg=COLORS['text'], fg='white', padx=15, pady=8,
+             font=('Segoe UI', 9)).pack()
+    toast.update_idletasks()
+    x = root.winfo_rootx() + (root.winfo_width() - toast.winfo_reqwidth()) // 2
+    y = root.winfo_rooty() + root.winfo_height() - toast.winfo_reqheight() - 40
+    toast.geometry(f"+{x}+{y}")
+    toast.after(duration, toast.destroy)
+
+# 右键菜单当前对应的贴图路径
+context_menu_path = None
+
+def create_context_menu(parent):
+    """创建现代风格的右键菜单（启动时创建一次，菜单命令读取 context_menu_path）"""
     menu = tk.Menu(
         parent,
         tearoff=0,
@@ -1812,31 +2293,22 @@ def create_context_menu(parent, texture_path):
     
     def copy_path():
         """制文件路径到剪贴板"""
-        pyperclip.copy(texture_path)
+        root.clipboard_clear()
+        root.clipboard_append(context_menu_path)
     
     def open_containing_folder():
         """打开文件所在文件夹"""
         try:
-            if os.name == 'nt':  # Windows
-                subprocess.run(['explorer', '/select,', texture_path])
-            elif os.name == 'darwin':  # macOS
-                subprocess.run(['open', '-R', texture_path])
-            else:  # Linux
-                subprocess.run(['xdg-open', os.path.dirname(texture_path)])
+            reveal_path(context_menu_path)
         except Exception as e:
-            messagebox.showerror("错误", f"打开文件夹时出错：{str(e)}")
+            show_toast(f"打开文件夹时出错：{str(e)}")
     
     def open_image():
         """使用系统默认程序打开图片"""
         try:
-            if os.name == 'nt':  # Windows
-                os.startfile(texture_path)
-            elif os.name == 'darwin':  # macOS
-                subprocess.run(['open', texture_path])
-            else:  # Linux
-                subprocess.run(['xdg-open', texture_path])
+            open_path(context_menu_path)
         except Exception as e:
-            messagebox.showerror("错误", f"打开图片时出错：{str(e)}")
+            show_toast(f"打开图片时出错：{str(e)}")
     
     menu.add_command(label="打开所在文件夹", command=open_containing_folder)
     menu.add_command(label="复制路径", command=copy_path)
@@ -1844,62 +2316,43 @@ def create_context_menu(parent, texture_path):
     
     return menu
 
+# 所有贴图共用的右键菜单
+context_menu = create_context_menu(root)
+
 def show_context_menu(event, texture_path):
     """显示右键菜单"""
-    menu = create_context_menu(event.widget, texture_path)
+    global context_menu_path
+    context_menu_path = texture_path
     try:
-        menu.tk_popup(event.x_root, event.y_root)
+        context_menu.tk_popup(event.x_root, event.y_root)
     finally:
-        menu.grab_release()
-
-# 在主循环前添加以下代码
-# 默认选中第一个标签
-if tabs:
-    tabs[0].event_generate('<Button-1>')
-
-# 默认选中第一个文件
-def select_first_file():
-    # 获取第个文件框架
-    first_file = None
-    for widget in frame_file.winfo_children():
-        if isinstance(widget, tk.Frame):
-            first_file = widget
-            break
-    
-    # 如果存在文件，选中它
-    if first_file:
-        select_label(first_file)
-
-# 在程序启动时调用
-root.after(100, select_first_file)  # 使用 after 确保界面完全加载后再执行
+        context_menu.grab_release()
 
 # 在主循环前添加以下代码
 def initialize_app():
     """初始化应用程序，选中第一个标签和文件"""
     # 选中第一个标签
     if tabs:
-        tabs[0].event_generate('<Button-1>')
+        activate_tab(0)
     
     # 选中第一个文件
-    first_file = None
-    for widget in frame_file.winfo_children():
-        if isinstance(widget, tk.Frame):
-            first_file = widget
-            break
+    first_file = next((widget for widget in frame_file.winfo_children() if isinstance(widget, tk.Frame)), None)
     
     # 如果存在文件，选中它
     if first_file:
         select_label(first_file)
 
-# 在程序启动时调用初始化函数
-root.after(100, initialize_app)
+def on_first_map(event):
+    """窗口第一次显示时初始化应用程序（只执行一次）"""
+    root.unbind('<Map>')
+    initialize_app()
+
+# 窗口显示后再初始化，不需要固定的延时
+root.bind('<Map>', on_first_map)
 
 # 修改所有按钮的样式
-style_button(open_button)
-style_button(delete_button)
-style_button(delete_texture_button)
-style_button(convert_button)
-style_button(open_folder_button)
+for button in (open_button, delete_button, delete_texture_button, convert_button, open_folder_button):
+    style_button(button)
 
 # 最后是主循环
 root.mainloop()
\ No newline at end of file